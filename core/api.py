@@ -11,6 +11,7 @@ from typing import Optional, Any
 
 import httpx
 import regex
+from async_lru import alru_cache
 from httpx import Request, Response, AsyncHTTPTransport
 from tenacity import (
     retry,
@@ -27,15 +28,13 @@ try:
 except ImportError:
     HAS_HISHEL = False
 
-from .config import PluginConfig, DownloadConfig
 from .models import (
     AlbumMeta,
     AlbumTracks,
     PlaylistInfo,
     PlaylistTracks,
-    ArtistAlbums,
-    ArtistSongs,
     ArtistInfo,
+    ResourceUrls,
     SongData,
 )
 
@@ -45,6 +44,48 @@ logger = logging.getLogger(__name__)
 # 启用调试日志
 logger.setLevel(logging.DEBUG)
 
+# Apple Music 目录 API 前缀
+_CATALOG_URL = "https://amp-api.music.apple.com/v1/catalog"
+
+# API 客户端固定请求头（Authorization 在获取 token 后追加）
+_BASE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Origin": "https://music.apple.com",
+}
+
+# 各接口固定查询参数，请求时仅追加语言等可变项
+_ALBUM_INFO_PARAMS = {
+    "omit[resource]": "autos",
+    "include": "tracks,artists,record-labels",
+    "include[songs]": "artists",
+    "fields[artists]": "name",
+    "fields[albums:albums]": "artistName,artwork,name,releaseDate,url",
+    "fields[record-labels]": "name",
+}
+_SONG_INFO_PARAMS = {"extend": "extendedAssetUrls", "include": "albums,explicit"}
+
+# 获取 token 的重试间隔（秒），按 2 的幂指数退避，上限 30 秒；尝试次数比间隔多一次
+_TOKEN_RETRY_DELAYS = tuple(min(2 ** attempt, 30) for attempt in range(4))
+
+# 地区存在性结果按 (资源 ID, 地区) 缓存，重叠的地区探测不再重复请求
+_EXIST_CACHE_SIZE = 1024
+_EXIST_CACHE_TTL = 600.0
+
+# 目录 API 连接池：延长空闲连接保活，多地区存在性探测间复用同一批 TLS 连接
+_CATALOG_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=32,
+    keepalive_expiry=60.0,
+)
+
+
+def _exists_from_status(resp: Response) -> bool:
+    """将存在性探测响应转换为确定结果：2xx 为存在，404 为不存在，其余状态抛出异常（不进入缓存）。"""
+    if resp.status_code == 404:
+        return False
+    resp.raise_for_status()
+    return True
+
 
 class NameSolver:
     """用于覆盖 Apple CDN IP 的自定义 DNS 解析器。"""
@@ -84,6 +125,7 @@ class WebAPI:
     """用于 Apple Music 的 Web API 客户端。"""
 
     client: Optional[httpx.AsyncClient]
+    _download_client: Optional[httpx.AsyncClient]
     download_lock: asyncio.Semaphore
     request_lock: asyncio.Semaphore
     token: Optional[str]
@@ -98,6 +140,7 @@ class WebAPI:
         self._proxy = proxy
         self.token = None
         self.client = None
+        self._download_client = None
         self._initialized = False
         self._token_lock = asyncio.Lock()
 
@@ -122,13 +165,10 @@ class WebAPI:
 
             # 使用 token 创建 HTTP 客户端
             client_kwargs: dict[str, Any] = {
-                "headers": {
-                    "Authorization": f"Bearer {self.token}",
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                    "Origin": "https://music.apple.com",
-                },
+                "headers": {**_BASE_HEADERS, "Authorization": f"Bearer {self.token}"},
                 "follow_redirects": True,
                 "timeout": 30.0,
+                "limits": _CATALOG_LIMITS,
             }
             if self._proxy:
                 client_kwargs["proxy"] = self._proxy
@@ -145,10 +185,11 @@ class WebAPI:
         """异步获取并设置 Apple Music API token。"""
         logger.info("[WebAPI] Fetching Apple Music API token (async)...")
 
-        max_attempts = 5
-        for attempt in range(max_attempts):
-            try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
+        max_attempts = len(_TOKEN_RETRY_DELAYS) + 1
+        # 重试之间复用同一个客户端，保留已建立的连接
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            for attempt in range(max_attempts):
+                try:
                     logger.debug(f"[WebAPI] Attempt {attempt + 1}/{max_attempts}: Requesting https://music.apple.com ...")
 
                     resp = await client.get("https://music.apple.com", follow_redirects=True)
@@ -173,15 +214,15 @@ class WebAPI:
                     logger.info(f"[WebAPI] Token obtained: {self.token[:20]}...")
                     return
 
-            except Exception as e:
-                logger.warning(f"[WebAPI] Attempt {attempt + 1}/{max_attempts} failed: {e}")
-                if attempt < max_attempts - 1:
-                    wait_time = min(2 ** attempt, 30)  # 指数退避，最大 30 秒
-                    logger.info(f"[WebAPI] Retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error("[WebAPI] All attempts to fetch token failed")
-                    raise
+                except Exception as e:
+                    logger.warning(f"[WebAPI] Attempt {attempt + 1}/{max_attempts} failed: {e}")
+                    if attempt < max_attempts - 1:
+                        wait_time = _TOKEN_RETRY_DELAYS[attempt]
+                        logger.info(f"[WebAPI] Retrying in {wait_time}s...")
+                        await asyncio.sleep(wait_time)
+                    else:
+                        logger.error("[WebAPI] All attempts to fetch token failed")
+                        raise
 
     @retry(
         retry=retry_if_exception_type((httpx.HTTPError, SSLError, FileNotFoundError)),
@@ -205,6 +246,17 @@ class WebAPI:
         """关闭 HTTP 客户端。"""
         if self.client:
             await self.client.aclose()
+        if self._download_client:
+            await self._download_client.aclose()
+            self._download_client = None
+
+    def _get_download_client(self) -> httpx.AsyncClient:
+        """获取音频下载客户端，跨下载复用连接池。"""
+        if self._download_client is None or self._download_client.is_closed:
+            self._download_client = httpx.AsyncClient(
+                transport=AsyncCustomHost(NameSolver(self.cdn_ip))
+            )
+        return self._download_client
 
     @retry(
         retry=retry_if_exception_type((httpx.HTTPError, SSLError, FileNotFoundError)),
@@ -228,36 +280,27 @@ class WebAPI:
         """下载音频数据。"""
         async with self.download_lock:
             result = BytesIO()
-            async with httpx.AsyncClient(
-                transport=AsyncCustomHost(NameSolver(self.cdn_ip))
-            ) as client:
-                async with client.stream("GET", url) as response:
-                    total = int(
-                        response.headers.get("Content-Length")
-                        or response.headers.get("X-Apple-MS-Content-Length", 0)
-                    )
-                    async for chunk in response.aiter_bytes():
-                        result.write(chunk)
-                    if total and len(result.getvalue()) != total:
-                        raise httpx.HTTPError("Incomplete download")
-                    return result.getvalue()
+            client = self._get_download_client()
+            async with client.stream("GET", url) as response:
+                total = int(
+                    response.headers.get("Content-Length")
+                    or response.headers.get("X-Apple-MS-Content-Length", 0)
+                )
+                async for chunk in response.aiter_bytes():
+                    result.write(chunk)
+                # 以写入偏移计长，避免为校验长度复制整个缓冲区
+                if total and result.tell() != total:
+                    raise httpx.HTTPError("Incomplete download")
+                return result.getvalue()
 
     async def get_album_info(self, album_id: str, storefront: str, lang: str) -> AlbumMeta:
         """获取专辑元数据。"""
         req = await self._request(
             "GET",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/albums/{album_id}",
-            params={
-                "omit[resource]": "autos",
-                "include": "tracks,artists,record-labels",
-                "include[songs]": "artists",
-                "fields[artists]": "name",
-                "fields[albums:albums]": "artistName,artwork,name,releaseDate,url",
-                "fields[record-labels]": "name",
-                "l": lang,
-            },
+            f"{_CATALOG_URL}/{storefront}/albums/{album_id}",
+            params={**_ALBUM_INFO_PARAMS, "l": lang},
         )
-        album_info_obj = AlbumMeta.model_validate(req.json())
+        album_info_obj = AlbumMeta.model_validate_json(req.content)
 
         # 处理曲目分页
         if album_info_obj.data[0].relationships.tracks.next:
@@ -272,9 +315,9 @@ class WebAPI:
         """分页获取专辑曲目。"""
         req = await self._request(
             "GET",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/albums/{album_id}/tracks?offset={offset}",
+            f"{_CATALOG_URL}/{storefront}/albums/{album_id}/tracks?offset={offset}",
         )
-        album_info_obj = AlbumTracks.model_validate(req.json())
+        album_info_obj = AlbumTracks.model_validate_json(req.content)
         tracks = album_info_obj.data or []
 
         if album_info_obj.next:
@@ -289,10 +332,10 @@ class WebAPI:
         """获取歌单信息与全部曲目。"""
         resp = await self._request(
             "GET",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/playlists/{playlist_id}",
+            f"{_CATALOG_URL}/{storefront}/playlists/{playlist_id}",
             params={"l": lang},
         )
-        playlist_info_obj = PlaylistInfo.model_validate(resp.json())
+        playlist_info_obj = PlaylistInfo.model_validate_json(resp.content)
 
         if playlist_info_obj.data[0].relationships.tracks.next:
             all_tracks = await self.get_playlist_tracks(playlist_id, storefront, lang)
@@ -306,10 +349,10 @@ class WebAPI:
         """分页获取歌单曲目。"""
         resp = await self._request(
             "GET",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/playlists/{playlist_id}/tracks",
+            f"{_CATALOG_URL}/{storefront}/playlists/{playlist_id}/tracks",
             params={"l": lang, "offset": offset},
         )
-        playlist_tracks = PlaylistTracks.model_validate(resp.json())
+        playlist_tracks = PlaylistTracks.model_validate_json(resp.content)
         tracks = playlist_tracks.data
 
         if playlist_tracks.next:
@@ -332,11 +375,11 @@ class WebAPI:
         logger.info(f"[WebAPI] get_song_info: song_id={song_id}, storefront={storefront}, lang={lang}")
         req = await self._request(
             "GET",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/songs/{song_id}",
-            params={"extend": "extendedAssetUrls", "include": "albums,explicit", "l": lang},
+            f"{_CATALOG_URL}/{storefront}/songs/{song_id}",
+            params={**_SONG_INFO_PARAMS, "l": lang},
         )
         logger.debug(f"[WebAPI] get_song_info response status: {req.status_code}")
-        song_data_obj = SongData.model_validate(req.json())
+        song_data_obj = SongData.model_validate_json(req.content)
 
         for data in song_data_obj.data:
             if data.id == song_id:
@@ -346,21 +389,23 @@ class WebAPI:
         logger.warning(f"[WebAPI] Song {song_id} not found in response")
         return None
 
+    @alru_cache(maxsize=_EXIST_CACHE_SIZE, ttl=_EXIST_CACHE_TTL)
     async def song_exist(self, song_id: str, storefront: str) -> bool:
         """检查歌曲是否存在于指定地区。"""
         req = await self._request(
             "HEAD",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/songs/{song_id}",
+            f"{_CATALOG_URL}/{storefront}/songs/{song_id}",
         )
-        return req.status_code == 200
+        return _exists_from_status(req)
 
+    @alru_cache(maxsize=_EXIST_CACHE_SIZE, ttl=_EXIST_CACHE_TTL)
     async def album_exist(self, album_id: str, storefront: str) -> bool:
         """检查专辑是否存在于指定地区。"""
         req = await self._request(
             "HEAD",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/albums/{album_id}",
+            f"{_CATALOG_URL}/{storefront}/albums/{album_id}",
         )
-        return req.status_code == 200
+        return _exists_from_status(req)
 
     async def get_albums_from_artist(
         self, artist_id: str, storefront: str, lang: str, offset: int = 0
@@ -368,10 +413,11 @@ class WebAPI:
         """获取艺人全部专辑链接。"""
         resp = await self._request(
             "GET",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/artists/{artist_id}/albums",
+            f"{_CATALOG_URL}/{storefront}/artists/{artist_id}/albums",
             params={"l": lang, "offset": offset},
         )
-        artist_album = ArtistAlbums.model_validate(resp.json())
+        # 只需专辑链接，按精简模型解析，其余字段不构建对象
+        artist_album = ResourceUrls.model_validate_json(resp.content)
         albums = [album.attributes.url for album in artist_album.data]
 
         if artist_album.next:
@@ -388,10 +434,10 @@ class WebAPI:
         """获取艺人全部歌曲链接。"""
         resp = await self._request(
             "GET",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/artists/{artist_id}/songs",
+            f"{_CATALOG_URL}/{storefront}/artists/{artist_id}/songs",
             params={"l": lang, "offset": offset},
         )
-        artist_song = ArtistSongs.model_validate(resp.json())
+        artist_song = ResourceUrls.model_validate_json(resp.content)
         songs = [song.attributes.url for song in artist_song.data]
 
         if artist_song.next:
@@ -406,10 +452,10 @@ class WebAPI:
         """获取艺人元数据。"""
         resp = await self._request(
             "GET",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/artists/{artist_id}",
+            f"{_CATALOG_URL}/{storefront}/artists/{artist_id}",
             params={"l": lang},
         )
-        return ArtistInfo.model_validate(resp.json())
+        return ArtistInfo.model_validate_json(resp.content)
 
     async def download_m3u8(self, m3u8_url: str) -> str:
         """下载 M3U8 内容。"""
@@ -425,13 +471,13 @@ class WebAPI:
         """按 UPC 查询专辑。"""
         req = await self._request(
             "GET",
-            f"https://amp-api.music.apple.com/v1/catalog/{storefront}/albums",
+            f"{_CATALOG_URL}/{storefront}/albums",
             params={"filter[upc]": upc},
         )
         resp = req.json()
         try:
             if resp["data"]:
-                return req.json()
+                return resp
             else:
                 return None
         except KeyError:
@@ -23,6 +23,12 @@ from .utils import playlist_write_song_index
 
 logger = logging.getLogger(__name__)
 
+# 艺术家下载时同时进行的专辑数，每张专辑内部另有单曲并发上限
+_MAX_CONCURRENT_ALBUMS = 2
+
+# 专辑存在性检查时同时探测的地区数，避免对目录 API 突发大量请求触发限流
+_MAX_CONCURRENT_REGION_PROBES = 6
+
 
 def _deep_merge(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
     """合并配置字典，优先使用 updates 覆盖。"""
@@ -171,22 +177,59 @@ async def _check_album_existence(
     status = await wrapper_service.get_status()
     regions = status.regions or [storefront]
 
-    for region in regions:
-        try:
-            if await api_client.exist_on_storefront_by_album_id(album_id, storefront, region):
-                return True
-        except (httpx.HTTPError, SSLError, FileNotFoundError) as exc:
+    # 当前地区本身可用时无需探测其他地区
+    storefront_upper = storefront.upper()
+    if any(region.upper() == storefront_upper for region in regions):
+        return True
+
+    # 各地区探测相互独立，并发执行；WebAPI 的请求信号量上限过高，这里单独限制并发
+    probe_slots = asyncio.Semaphore(_MAX_CONCURRENT_REGION_PROBES)
+
+    async def probe(region: str) -> bool:
+        async with probe_slots:
+            return await api_client.exist_on_storefront_by_album_id(album_id, storefront, region)
+
+    results = await asyncio.gather(
+        *(probe(region) for region in regions),
+        return_exceptions=True,
+    )
+
+    exists = False
+    unexpected: Optional[BaseException] = None
+    for region, result in zip(regions, results):
+        if isinstance(result, (httpx.HTTPError, SSLError, FileNotFoundError)):
             logger.warning(
                 "检查专辑存在性失败 stage=exist_check album_id=%s storefront=%s region=%s exc_type=%s",
                 album_id,
                 storefront,
                 region,
-                type(exc).__name__,
-                exc_info=True,
+                type(result).__name__,
+                exc_info=result,
             )
             continue
+        if isinstance(result, BaseException):
+            unexpected = unexpected or result
+            continue
+        if result:
+            exists = True
 
-    return False
+    # 与逐个探测时一致：已确认存在则忽略其余地区的异常
+    if not exists and unexpected is not None:
+        raise unexpected
+    return exists
+
+
+async def _gather_or_cancel(tasks: list[asyncio.Task]) -> list:
+    """等待全部任务；任一任务出错或自身被取消时，取消并回收其余任务后再抛出。"""
+    # 语义同 asyncio.TaskGroup（3.11+），手动实现以兼容 3.10
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
 
 async def _prompt_input(prompt: str) -> str:
@@ -195,6 +238,12 @@ async def _prompt_input(prompt: str) -> str:
     return await loop.run_in_executor(None, input, prompt)
 
 
+async def _prompt_secret(prompt: str) -> str:
+    """异步读取不回显的用户输入。"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, getpass, prompt)
+
+
 async def _handle_status(config: PluginConfig) -> int:
     """显示服务状态。"""
     wrapper_service = WrapperService(config)
@@ -252,14 +301,16 @@ async def _handle_accounts(config: PluginConfig) -> int:
         await wrapper_service.close()
 
 
-async def _handle_login(config: PluginConfig, username: str, password: str) -> int:
+async def _handle_login(
+    config: PluginConfig, username: str, password: str, two_step_code: str = ""
+) -> int:
     """登录 Apple Music 账户。"""
     wrapper_service = WrapperService(config)
     try:
         if not username:
-            username = input("Apple ID: ").strip()
+            username = (await _prompt_input("Apple ID: ")).strip()
         if not password:
-            password = getpass("密码: ")
+            password = await _prompt_secret("密码: ")
 
         success, msg = await wrapper_service.init()
         if not success:
@@ -272,6 +323,11 @@ async def _handle_login(config: PluginConfig, username: str, password: str) -> i
             return 1
 
         async def on_2fa(uname: str, pwd: str) -> str:
+            nonlocal two_step_code
+            # 命令行提供的验证码只使用一次，再次要求验证时改为交互输入
+            if two_step_code:
+                code, two_step_code = two_step_code, ""
+                return code
             print("需要双因素验证码")
             code = await _prompt_input("请输入 6 位验证码: ")
             return code.strip()
@@ -469,7 +525,7 @@ async def _download_batch(
             )
 
     tasks = [asyncio.create_task(bounded_download(song_url)) for song_url in song_urls]
-    results = await asyncio.gather(*tasks)
+    results = await _gather_or_cancel(tasks)
     failed = sum(1 for code in results if code != 0)
 
     if failed:
@@ -593,23 +649,26 @@ async def _download_artist(
         print("× 未找到可下载的专辑")
         return 1
 
+    album_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_ALBUMS)
+
     async def download_album_url(album_url: str) -> int:
         album_obj = AppleMusicURL.parse_url(album_url)
         if not album_obj:
             return 1
-        return await _download_album(
-            downloader_service,
-            wrapper_service,
-            api_client,
-            album_obj,
-            download_quality,
-            force,
-            progress_callback,
-            config,
-        )
+        async with album_semaphore:
+            return await _download_album(
+                downloader_service,
+                wrapper_service,
+                api_client,
+                album_obj,
+                download_quality,
+                force,
+                progress_callback,
+                config,
+            )
 
     tasks = [asyncio.create_task(download_album_url(album_url)) for album_url in album_urls]
-    results = await asyncio.gather(*tasks)
+    results = await _gather_or_cancel(tasks)
     failed = sum(1 for code in results if code != 0)
     if failed:
         print(f"\n× 艺术家专辑下载完成，失败 {failed} 项")
@@ -645,6 +704,7 @@ def _build_parser() -> argparse.ArgumentParser:
     login_parser = subparsers.add_parser("login", help="登录账户")
     login_parser.add_argument("-u", "--username", default="")
     login_parser.add_argument("-p", "--password", default="")
+    login_parser.add_argument("-c", "--code", default="", help="双因素验证码（非交互登录）")
 
     logout_parser = subparsers.add_parser("logout", help="登出账户")
     logout_parser.add_argument("-u", "--username", required=True)
@@ -692,7 +752,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     if args.command == "accounts":
         return asyncio.run(_handle_accounts(config))
     if args.command == "login":
-        return asyncio.run(_handle_login(config, args.username, args.password))
+        return asyncio.run(_handle_login(config, args.username, args.password, args.code))
     if args.command == "logout":
         return asyncio.run(_handle_logout(config, args.username))
     if args.command == "download":
@@ -4,6 +4,7 @@ Apple Music Downloader 插件配置管理。
 """
 
 from dataclasses import dataclass, field
+import importlib
 import logging
 from pathlib import Path
 from typing import Optional
@@ -217,7 +218,6 @@ class PluginConfig:
     def _resolve_astrbot_data_dir(self) -> Optional[Path]:
         """尝试解析 AstrBot 的 data 目录。"""
         try:
-            import importlib
             module = importlib.import_module("astrbot.core.utils.astrbot_path")
             return module.get_astrbot_data_path()
         except (ImportError, AttributeError, OSError) as exc:
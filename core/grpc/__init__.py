@@ -2,9 +2,10 @@
 Apple Music Downloader gRPC 模块。
 """
 
-from .manager import WrapperManager, WrapperManagerException
+from .manager import ReplyCode, WrapperManager, WrapperManagerException
 
 __all__ = [
+    "ReplyCode",
     "WrapperManager",
     "WrapperManagerException",
 ]
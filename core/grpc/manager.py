@@ -6,7 +6,9 @@ gRPC Wrapper 管理器客户端。
 import asyncio
 import json
 import logging
-from typing import Awaitable, Callable, Optional
+import weakref
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Iterable, Optional
 
 import grpc
 from async_lru import alru_cache
@@ -53,6 +55,40 @@ from .manager_pb2_grpc import WrapperManagerServiceStub, google_dot_protobuf_dot
 # 模块日志
 logger = logging.getLogger(__name__)
 
+# 状态查询缓存时间（秒），短时间内的重复查询直接复用结果
+_STATUS_CACHE_TTL = 5.0
+
+# 歌词缓存容量与有效期（秒），同一歌曲重复下载时无需再次请求
+_LYRICS_CACHE_SIZE = 1024
+_LYRICS_CACHE_TTL = 600.0
+
+# 一元调用使用的通道数量，各通道独立建立 HTTP/2 连接
+_CHANNEL_POOL_SIZE = 4
+
+# gRPC 消息大小上限与 HTTP/2 写缓冲大小
+_MAX_MESSAGE_LENGTH = 64 << 20
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# 单批处理的解密回复上限，过大会拉高单个样本的等待时间
+_DECRYPT_REPLY_BATCH = 16
+
+# 解密流保活标识与预构建的保活请求，消息内容固定，无需每次重新构造
+_KEEPALIVE_ADAM_ID = "KEEPALIVE"
+_KEEPALIVE_REQUEST = DecryptRequest(data=DecryptData(adam_id=_KEEPALIVE_ADAM_ID))
+
+# Status 请求体恒为空消息，复用同一实例
+_EMPTY_REQUEST = google_dot_protobuf_dot_empty__pb2.Empty()
+
+# 通道池为空（未初始化或已关闭）时的错误信息，此类错误重试无意义
+_NOT_CONNECTED_MSG = "not connected"
+
+
+class ReplyCode(IntEnum):
+    """Wrapper Manager 回复头状态码。"""
+    ERROR = -1
+    SUCCESS = 0
+    NEED_2FA = 2
+
 
 class WrapperManagerException(Exception):
     """操作异常（WrapperManager）。"""
@@ -64,20 +100,32 @@ class WrapperManagerException(Exception):
 class WrapperManager:
     """用于 Wrapper Manager 的 gRPC 客户端。"""
 
-    _channel: Channel
+    _channels: list[Channel]
+    _stubs: list[WrapperManagerServiceStub]
     _stub: WrapperManagerServiceStub
+    _rr_index: int
+    _inflight: list[int]
+    _loop: Optional[asyncio.AbstractEventLoop]
     _decrypt_queue: asyncio.Queue
-    _login_lock: asyncio.Lock
+    _login_locks: weakref.WeakValueDictionary[str, asyncio.Lock]
     _background_tasks: set
     _initialized: bool
 
     def __init__(self):
-        self._login_lock = asyncio.Lock()
+        # 弱引用持有：账户无人登录或等待时锁自动回收，字典不随账户数增长
+        self._login_locks = weakref.WeakValueDictionary()
         self._decrypt_queue = asyncio.Queue()
         self._background_tasks = set()
+        self._channels = []
+        self._stubs = []
+        self._rr_index = 0
+        self._inflight = []
+        self._loop = None
         self._initialized = False
 
-    async def init(self, url: str, secure: bool = False) -> "WrapperManager":
+    async def init(
+        self, url: str, secure: bool = False, pool_size: int = _CHANNEL_POOL_SIZE
+    ) -> "WrapperManager":
         """初始化 gRPC 连接。"""
         service_config_json = json.dumps(
             {
@@ -98,48 +146,90 @@ class WrapperManager:
         options = (
             (ChannelOptions.SingleThreadedUnaryStream, 1),
             ("grpc.service_config", service_config_json),
+            # 禁用全局子通道复用，保证池中每个通道使用独立连接
+            ("grpc.use_local_subchannel_pool", 1),
+            # 放宽消息大小上限（默认接收 4MB），大段歌词与样本不会被拒
+            ("grpc.max_send_message_length", _MAX_MESSAGE_LENGTH),
+            ("grpc.max_receive_message_length", _MAX_MESSAGE_LENGTH),
+            # 加大写缓冲，解密流批量发送样本时减少刷写次数
+            ("grpc.http2.write_buffer_size", _WRITE_BUFFER_SIZE),
         )
 
-        if secure:
-            self._channel = secure_channel(url, credentials=ssl_channel_credentials(), options=options)
-        else:
-            self._channel = insecure_channel(url, options=options)
-
-        self._stub = WrapperManagerServiceStub(self._channel)
+        for _ in range(max(1, pool_size)):
+            if secure:
+                channel = secure_channel(url, credentials=ssl_channel_credentials(), options=options)
+            else:
+                channel = insecure_channel(url, options=options)
+            self._channels.append(channel)
+            self._stubs.append(WrapperManagerServiceStub(channel))
+            self._inflight.append(0)
+
+        # 登录与解密双向流固定使用首个通道
+        self._stub = self._stubs[0]
+        # 后台任务都在初始化时的事件循环上创建，缓存引用避免重复查找
+        self._loop = asyncio.get_running_loop()
         self._initialized = True
         return self
 
+    def _acquire_channel(self) -> int:
+        """选择在途请求最少的通道，负载相同时轮询。"""
+        count = len(self._stubs)
+        if not count:
+            raise WrapperManagerException(_NOT_CONNECTED_MSG)
+        start = self._rr_index % count
+        self._rr_index += 1
+        index = min(range(start, start + count), key=lambda i: self._inflight[i % count]) % count
+        self._inflight[index] += 1
+        return index
+
+    async def _call_unary(
+        self,
+        method: Callable[[WrapperManagerServiceStub], Callable[[Any], Awaitable[Any]]],
+        request,
+    ):
+        """在负载最低的通道上执行一元调用，method 从 stub 中选出对应的 RPC。"""
+        # 持有计数表引用，close() 换表后在途调用仍能正确回收计数
+        inflight = self._inflight
+        index = self._acquire_channel()
+        try:
+            return await method(self._stubs[index])(request)
+        finally:
+            inflight[index] -= 1
+
     async def close(self):
         """关闭 gRPC 通道并取消后台任务。"""
         for task in self._background_tasks:
             task.cancel()
         self._background_tasks.clear()
 
-        if self._initialized and hasattr(self, '_channel'):
-            await self._channel.close()
+        if self._initialized:
+            for channel in self._channels:
+                await channel.close()
+            self._channels.clear()
+            self._stubs.clear()
+            self._inflight = []
             self._initialized = False
 
     def _safely_create_task(self, coro):
         """创建任务并纳入清理跟踪。"""
-        loop = asyncio.get_event_loop()
-        task = loop.create_task(coro)
+        task = self._loop.create_task(coro)
         self._background_tasks.add(task)
-
-        def done_callback(t):
-            self._background_tasks.discard(t)
-            if t.exception():
-                try:
-                    raise t.exception()
-                except Exception as e:
-                    logger.exception(f"Background task error: {e}")
-
-        task.add_done_callback(done_callback)
-
-    @alru_cache
+        task.add_done_callback(self._on_background_task_done)
+
+    def _on_background_task_done(self, task: asyncio.Task):
+        """后台任务结束回调：移除跟踪并记录异常。"""
+        self._background_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error(f"Background task error: {exc}", exc_info=exc)
+
+    @alru_cache(ttl=_STATUS_CACHE_TTL)
     async def status(self) -> StatusData:
         """获取 wrapper 服务状态。"""
-        resp: StatusReply = await self._stub.Status(google_dot_protobuf_dot_empty__pb2.Empty())
-        if resp.header.code != 0:
+        resp: StatusReply = await self._call_unary(lambda stub: stub.Status, _EMPTY_REQUEST)
+        if resp.header.code != ReplyCode.SUCCESS:
             raise WrapperManagerException(resp.header.msg)
         return resp.data
 
@@ -150,7 +240,11 @@ class WrapperManager:
         on_2fa: Callable[[str, str], Awaitable[str]]
     ):
         """登录 Apple Music 账户。"""
-        await self._login_lock.acquire()
+        # 按账户加锁：同一账户串行登录，不同账户的登录（含等待 2FA）互不阻塞
+        login_lock = self._login_locks.get(username)
+        if login_lock is None:
+            login_lock = self._login_locks[username] = asyncio.Lock()
+        await login_lock.acquire()
 
         login_queue: asyncio.Queue = asyncio.Queue()
 
@@ -161,23 +255,24 @@ class WrapperManager:
                     break
                 yield item
 
-        stream = self._stub.Login(request_stream())
+        try:
+            stream = self._stub.Login(request_stream())
 
-        await login_queue.put(
-            LoginRequest(data=LoginData(username=username, password=password))
-        )
+            await login_queue.put(
+                LoginRequest(data=LoginData(username=username, password=password))
+            )
 
-        try:
             async for reply in stream:
                 reply: LoginReply
                 match reply.header.code:
-                    case -1:
+                    case ReplyCode.ERROR:
                         await login_queue.put(None)
                         raise WrapperManagerException(reply.header.msg)
-                    case 0:
+                    case ReplyCode.SUCCESS:
                         await login_queue.put(None)
+                        self.status.cache_clear()
                         return
-                    case 2:
+                    case ReplyCode.NEED_2FA:
                         two_step_code = await on_2fa(username, password)
                         await login_queue.put(
                             LoginRequest(
@@ -189,7 +284,9 @@ class WrapperManager:
                             )
                         )
         finally:
-            self._login_lock.release()
+            # 2FA 回调失败或超时时同样结束请求流，避免登录流悬挂
+            login_queue.put_nowait(None)
+            login_lock.release()
 
     async def decrypt(self, adam_id: str, key: str, sample: bytes, sample_index: int):
         """将样本加入解密队列。"""
@@ -204,6 +301,22 @@ class WrapperManager:
             )
         )
 
+    async def decrypt_many(self, adam_id: str, samples: Iterable[tuple[str, bytes, int]]):
+        """将同一歌曲的一批 (key, sample, sample_index) 一次性加入解密队列。"""
+        # 解密队列无界，入队不会阻塞，直接 put_nowait 省去逐个样本的协程调度
+        put = self._decrypt_queue.put_nowait
+        for key, sample, sample_index in samples:
+            put(
+                DecryptRequest(
+                    data=DecryptData(
+                        adam_id=adam_id,
+                        key=key,
+                        sample_index=sample_index,
+                        sample=sample,
+                    )
+                )
+            )
+
     async def _decrypt_request_generator(self):
         """从队列生成解密请求。"""
         while True:
@@ -216,53 +329,78 @@ class WrapperManager:
     ):
         """初始化解密流。"""
         async def handle_stream():
+            reply_queue: asyncio.Queue = asyncio.Queue()
+            self._safely_create_task(
+                self._dispatch_decrypt_replies(reply_queue, on_success, on_failure)
+            )
             try:
                 stream = self._stub.Decrypt(self._decrypt_request_generator())
                 self._safely_create_task(self._decrypt_keepalive())
 
                 async for reply in stream:
                     reply: DecryptReply
-                    if reply.data.adam_id == "KEEPALIVE":
+                    if reply.data.adam_id == _KEEPALIVE_ADAM_ID:
                         continue
-                    match reply.header.code:
-                        case -1:
-                            self._safely_create_task(
-                                on_failure(
-                                    reply.data.adam_id,
-                                    reply.data.key,
-                                    reply.data.sample,
-                                    reply.data.sample_index,
-                                )
-                            )
-                        case 0:
-                            self._safely_create_task(
-                                on_success(
-                                    reply.data.adam_id,
-                                    reply.data.key,
-                                    reply.data.sample,
-                                    reply.data.sample_index,
-                                )
-                            )
+                    reply_queue.put_nowait(reply)
             except grpc.aio.AioRpcError as e:
                 logger.error(f"[Decrypt] Stream error: {e}")
             except Exception as e:
                 logger.error(f"[Decrypt] Unexpected error: {e}", exc_info=True)
+            finally:
+                reply_queue.put_nowait(None)
 
         self._safely_create_task(handle_stream())
         logger.info("[Decrypt] Stream initialized")
 
+    async def _dispatch_decrypt_replies(
+        self,
+        reply_queue: asyncio.Queue,
+        on_success: Callable[[str, str, bytes, int], Awaitable[None]],
+        on_failure: Callable[[str, str, bytes, int], Awaitable[None]],
+    ):
+        """批量分发解密回复，避免每条回复单独创建任务。"""
+        stopped = False
+        while not stopped:
+            batch = [await reply_queue.get()]
+            while len(batch) < _DECRYPT_REPLY_BATCH and not reply_queue.empty():
+                batch.append(reply_queue.get_nowait())
+
+            callbacks = []
+            for reply in batch:
+                if reply is None:
+                    stopped = True
+                    continue
+                match reply.header.code:
+                    case ReplyCode.ERROR:
+                        handler = on_failure
+                    case ReplyCode.SUCCESS:
+                        handler = on_success
+                    case _:
+                        continue
+                callbacks.append(
+                    handler(
+                        reply.data.adam_id,
+                        reply.data.key,
+                        reply.data.sample,
+                        reply.data.sample_index,
+                    )
+                )
+
+            for result in await asyncio.gather(*callbacks, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.error(f"[Decrypt] Reply callback error: {result}", exc_info=result)
+
     async def _decrypt_keepalive(self):
         """定时发送保活消息。"""
         while True:
-            await self._decrypt_queue.put(
-                DecryptRequest(data=DecryptData(adam_id="KEEPALIVE"))
-            )
+            await self._decrypt_queue.put(_KEEPALIVE_REQUEST)
             await asyncio.sleep(15)
 
     @retry(
         retry=(
             retry_if_exception_type(WrapperManagerException)
             & retry_if_not_exception_message("no available instance")
+            & retry_if_not_exception_message(_NOT_CONNECTED_MSG)
         ),
         wait=wait_random_exponential(multiplier=1, max=60),
         stop=stop_after_attempt(32),
@@ -270,10 +408,11 @@ class WrapperManager:
     )
     async def m3u8(self, adam_id: str) -> str:
         """获取歌曲 M3U8 内容。"""
-        resp: M3U8Reply = await self._stub.M3U8(
+        resp: M3U8Reply = await self._call_unary(
+            lambda stub: stub.M3U8,
             M3U8Request(data=M3U8DataRequest(adam_id=adam_id))
         )
-        if resp.header.code != 0:
+        if resp.header.code != ReplyCode.SUCCESS:
             raise WrapperManagerException(resp.header.msg)
         return resp.data.m3u8
 
@@ -281,6 +420,7 @@ class WrapperManager:
         retry=(
             retry_if_exception_type(WrapperManagerException)
             & retry_if_not_exception_message("no such account")
+            & retry_if_not_exception_message(_NOT_CONNECTED_MSG)
         ),
         wait=wait_random_exponential(multiplier=1, max=60),
         stop=stop_after_attempt(32),
@@ -288,16 +428,20 @@ class WrapperManager:
     )
     async def logout(self, username: str):
         """登出 Apple Music 账户。"""
-        resp: LogoutReply = await self._stub.Logout(
+        resp: LogoutReply = await self._call_unary(
+            lambda stub: stub.Logout,
             LogoutRequest(data=LogoutData(username=username))
         )
-        if resp.header.code != 0:
+        if resp.header.code != ReplyCode.SUCCESS:
             raise WrapperManagerException(resp.header.msg)
+        self.status.cache_clear()
 
+    @alru_cache(maxsize=_LYRICS_CACHE_SIZE, ttl=_LYRICS_CACHE_TTL)
     @retry(
         retry=(
             retry_if_exception_type(WrapperManagerException)
             & retry_if_not_exception_message("no available instance")
+            & retry_if_not_exception_message(_NOT_CONNECTED_MSG)
         ),
         wait=wait_random_exponential(multiplier=1, max=60),
         stop=stop_after_attempt(32),
@@ -305,12 +449,13 @@ class WrapperManager:
     )
     async def lyrics(self, adam_id: str, language: str, region: str) -> str:
         """获取歌曲歌词。"""
-        resp: LyricsReply = await self._stub.Lyrics(
+        resp: LyricsReply = await self._call_unary(
+            lambda stub: stub.Lyrics,
             LyricsRequest(
                 data=LyricsDataRequest(adam_id=adam_id, language=language, region=region)
             )
         )
-        if resp.header.code != 0:
+        if resp.header.code != ReplyCode.SUCCESS:
             raise WrapperManagerException(resp.header.msg)
         return resp.data.lyrics
 
@@ -318,6 +463,7 @@ class WrapperManager:
         retry=(
             retry_if_exception_type(WrapperManagerException)
             & retry_if_not_exception_message("no available instance")
+            & retry_if_not_exception_message(_NOT_CONNECTED_MSG)
         ),
         wait=wait_random_exponential(multiplier=1, max=60),
         stop=stop_after_attempt(32),
@@ -325,10 +471,11 @@ class WrapperManager:
     )
     async def web_playback(self, adam_id: str) -> str:
         """获取 WebPlayback M3U8（AAC-Legacy）。"""
-        resp: WebPlaybackReply = await self._stub.WebPlayback(
+        resp: WebPlaybackReply = await self._call_unary(
+            lambda stub: stub.WebPlayback,
             WebPlaybackRequest(data=WebPlaybackDataRequest(adam_id=adam_id))
         )
-        if resp.header.code != 0:
+        if resp.header.code != ReplyCode.SUCCESS:
             raise WrapperManagerException(resp.header.msg)
         return resp.data.m3u8
 
@@ -336,6 +483,7 @@ class WrapperManager:
         retry=(
             retry_if_exception_type(WrapperManagerException)
             & retry_if_not_exception_message("no available instance")
+            & retry_if_not_exception_message(_NOT_CONNECTED_MSG)
         ),
         wait=wait_random_exponential(multiplier=1, max=60),
         stop=stop_after_attempt(32),
@@ -343,11 +491,12 @@ class WrapperManager:
     )
     async def license(self, adam_id: str, challenge: str, kid: str) -> str:
         """获取 Widevine License。"""
-        resp: LicenseReply = await self._stub.License(
+        resp: LicenseReply = await self._call_unary(
+            lambda stub: stub.License,
             LicenseRequest(
                 data=LicenseDataRequest(adam_id=adam_id, challenge=challenge, uri=kid)
             )
         )
-        if resp.header.code != 0:
+        if resp.header.code != ReplyCode.SUCCESS:
             raise WrapperManagerException(resp.header.msg)
         return resp.data.license
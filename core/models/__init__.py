@@ -11,6 +11,7 @@ from .artist_albums import ArtistAlbums
 from .artist_songs import ArtistSongs
 from .playlist_info import PlaylistInfo
 from .playlist_tracks import PlaylistTracks
+from .resource_urls import ResourceUrls
 from .song_lyrics import SongLyrics
 from .tracks_meta import TracksMeta
 
@@ -24,6 +25,7 @@ __all__ = [
     "ArtistSongs",
     "PlaylistInfo",
     "PlaylistTracks",
+    "ResourceUrls",
     "SongLyrics",
     "TracksMeta",
 ]
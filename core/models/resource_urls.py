@@ -0,0 +1,17 @@
+"""资源链接分页模型（仅解析 url 字段）。"""
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class Attributes(BaseModel):
+    url: Optional[str] = None
+
+
+class Datum(BaseModel):
+    attributes: Attributes
+
+
+class ResourceUrls(BaseModel):
+    next: Optional[str] = None
+    data: List[Datum]
@@ -3,9 +3,10 @@ MP4 处理模块。
 负责提取、封装与写入元数据。
 """
 
-import os
+import logging
+import secrets
 import subprocess
-import uuid
+from functools import cache
 from io import BytesIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -17,7 +18,7 @@ import mutagen.mp4
 from bs4 import BeautifulSoup
 
 from .types import (
-    Codec, CodecRegex, CodecKeySuffix, M3U8Info,
+    Codec, CodecKeySuffix, M3U8Info,
     SongInfo, SampleInfo, PREFETCH_KEY
 )
 from .metadata import SongMetadata
@@ -32,9 +33,42 @@ class CodecNotFoundException(Exception):
     pass
 
 
+logger = logging.getLogger(__name__)
+
+_BINARIES_DIR = Path(__file__).parent.parent / "binaries"
+_BENTO4_BIN_DIRS = (
+    _BINARIES_DIR / "bento4" / "Bento4-SDK-1-6-0-641.x86_64-microsoft-win32" / "bin",
+    Path(r"C:\Program Files\Bento4"),
+    Path(r"C:\Bento4\bin"),
+)
+
+
+@cache
+def _find_tool(default: str, *candidates: Path) -> str:
+    """按候选路径查找外部工具，未找到时使用 PATH 中的命令名（结果缓存）。"""
+    for candidate in candidates:
+        if candidate.exists():
+            return f'"{candidate}"'
+    return default
+
+
+def _find_bento4_tool(name: str) -> str:
+    """查找 Bento4 工具。"""
+    return _find_tool(name, *(d / f"{name}.exe" for d in _BENTO4_BIN_DIRS))
+
+
+@cache
+def _find_bento4_bin_dir() -> Optional[Path]:
+    """查找包含 mp4extract 的 Bento4 目录（结果缓存）。"""
+    for bento4_bin in _BENTO4_BIN_DIRS:
+        if (bento4_bin / "mp4extract.exe").exists():
+            return bento4_bin
+    return None
+
+
 def _new_temp_dir_with_name() -> tuple[TemporaryDirectory, str, Path]:
     tmp_dir = TemporaryDirectory()
-    name = uuid.uuid4().hex
+    name = secrets.token_hex(16)
     return tmp_dir, name, Path(tmp_dir.name)
 
 
@@ -132,9 +166,7 @@ def extract_song(raw_song: bytes, codec: str) -> SongInfo:
 
     # 使用 gpac 提取 NHML
     # 尝试在常见路径查找 gpac
-    gpac_cmd = "gpac"
-    if os.path.exists(r"C:\Program Files\GPAC\gpac.exe"):
-        gpac_cmd = r'"C:\Program Files\GPAC\gpac.exe"'
+    gpac_cmd = _find_tool("gpac", Path(r"C:\Program Files\GPAC\gpac.exe"))
 
     subprocess.run(
         f"{gpac_cmd} -i {raw_mp4.absolute()} nhmlw:pckp=true -o {nhml_name}",
@@ -144,9 +176,7 @@ def extract_song(raw_song: bytes, codec: str) -> SongInfo:
     xml_name = (tmp_path / Path(mp4_name).with_suffix('.xml')).absolute()
 
     # 使用 MP4Box 提取 ISO 信息
-    mp4box_cmd = "MP4Box"
-    if os.path.exists(r"C:\Program Files\GPAC\MP4Box.exe"):
-        mp4box_cmd = r'"C:\Program Files\GPAC\MP4Box.exe"'
+    mp4box_cmd = _find_tool("MP4Box", Path(r"C:\Program Files\GPAC\MP4Box.exe"))
 
     subprocess.run(
         f"{mp4box_cmd} -diso {raw_mp4.absolute()} -out {xml_name}",
@@ -154,17 +184,7 @@ def extract_song(raw_song: bytes, codec: str) -> SongInfo:
     )
 
     # 查找 mp4extract（Bento4 工具）
-    mp4extract_cmd = "mp4extract"
-    # 检查 Bento4 常见路径
-    bento4_paths = [
-        Path(__file__).parent.parent / "binaries" / "bento4" / "Bento4-SDK-1-6-0-641.x86_64-microsoft-win32" / "bin" / "mp4extract.exe",
-        Path(r"C:\Program Files\Bento4\mp4extract.exe"),
-        Path(r"C:\Bento4\bin\mp4extract.exe"),
-    ]
-    for bento4_path in bento4_paths:
-        if bento4_path.exists():
-            mp4extract_cmd = f'"{bento4_path}"'
-            break
+    mp4extract_cmd = _find_bento4_tool("mp4extract")
 
     decoder_params = None
 
@@ -183,23 +203,34 @@ def extract_song(raw_song: bytes, codec: str) -> SongInfo:
         case Codec.ALAC:
             alac_atom_name = (tmp_path / Path(mp4_name).with_suffix('.atom')).absolute()
             mp4extract_cmd_str = f"{mp4extract_cmd} moov/trak/mdia/minf/stbl/stsd/enca[0]/alac {raw_mp4.absolute()} {alac_atom_name}"
-            print(f"[DEBUG extract_song] mp4extract command: {mp4extract_cmd_str}")
+            # 排查信息仅在 DEBUG 级别输出，避免额外的 stat 与十六进制格式化
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                logger.debug("[extract_song] mp4extract command: %s", mp4extract_cmd_str)
+            # 输出仅用于调试日志，非 DEBUG 时直接丢弃不再收集
             result = subprocess.run(
                 mp4extract_cmd_str,
-                capture_output=True, shell=if_shell()
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE if debug_enabled else subprocess.DEVNULL,
+                shell=if_shell()
             )
-            print(f"[DEBUG extract_song] mp4extract return code: {result.returncode}")
-            if result.stderr:
-                print(f"[DEBUG extract_song] mp4extract stderr: {result.stderr.decode('utf-8', errors='ignore')}")
+            if debug_enabled:
+                logger.debug("[extract_song] mp4extract return code: %s", result.returncode)
+                if result.stderr:
+                    logger.debug(
+                        "[extract_song] mp4extract stderr: %s",
+                        result.stderr.decode('utf-8', errors='ignore')
+                    )
             if not alac_atom_name.exists():
-                print(f"[DEBUG extract_song] ERROR: ALAC atom file not created!")
-            else:
-                print(f"[DEBUG extract_song] ALAC atom file size: {alac_atom_name.stat().st_size} bytes")
+                logger.warning("[extract_song] ALAC atom file not created")
+            elif debug_enabled:
+                logger.debug("[extract_song] ALAC atom file size: %s bytes", alac_atom_name.stat().st_size)
             with open(alac_atom_name, "rb") as f:
                 decoder_params = f.read()
-            print(f"[DEBUG extract_song] decoderParams length: {len(decoder_params)} bytes")
-            # 输出前 48 字节十六进制用于排查
-            print(f"[DEBUG extract_song] decoderParams hex (first 48): {decoder_params[:48].hex()}")
+            if debug_enabled:
+                logger.debug("[extract_song] decoderParams length: %s bytes", len(decoder_params))
+                # 输出前 48 字节十六进制用于排查
+                logger.debug("[extract_song] decoderParams hex (first 48): %s", decoder_params[:48].hex())
 
         case Codec.AAC | Codec.AAC_DOWNMIX | Codec.AAC_BINAURAL | Codec.AAC_LEGACY:
             info_name = (tmp_path / Path(mp4_name).with_suffix('.info')).absolute()
@@ -268,27 +299,14 @@ def encapsulate(song_info: SongInfo, decrypted_media: bytes, atmos_convert: bool
     song_name = tmp_path / Path(name).with_suffix(get_suffix(song_info.codec, atmos_convert))
 
     # 查找 GPAC 工具（Windows 为 gpac.exe）
-    gpac_cmd = "gpac"
-    gpac_paths = [
+    gpac_cmd = _find_tool(
+        "gpac",
         Path(r"C:\Program Files\GPAC\gpac.exe"),
-        Path(__file__).parent.parent / "binaries" / "gpac" / "gpac.exe",
-    ]
-    for gpac_path in gpac_paths:
-        if gpac_path.exists():
-            gpac_cmd = f'"{gpac_path}"'
-            break
+        _BINARIES_DIR / "gpac" / "gpac.exe",
+    )
 
     # 查找 Bento4 的 mp4edit 工具
-    mp4edit_cmd = "mp4edit"
-    bento4_paths = [
-        Path(__file__).parent.parent / "binaries" / "bento4" / "Bento4-SDK-1-6-0-641.x86_64-microsoft-win32" / "bin" / "mp4edit.exe",
-        Path(r"C:\Program Files\Bento4\mp4edit.exe"),
-        Path(r"C:\Bento4\bin\mp4edit.exe"),
-    ]
-    for bento4_path in bento4_paths:
-        if bento4_path.exists():
-            mp4edit_cmd = f'"{bento4_path}"'
-            break
+    mp4edit_cmd = _find_bento4_tool("mp4edit")
 
     match song_info.codec:
         case Codec.ALAC:
@@ -298,22 +316,33 @@ def encapsulate(song_info: SongInfo, decrypted_media: bytes, atmos_convert: bool
                 nhml_xml.NHNTStream["baseMediaFile"] = media.name
                 f.write(str(nhml_xml))
 
-            print(f"[DEBUG encapsulate] gpac nhmlr command...")
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            logger.debug("[encapsulate] gpac nhmlr command...")
             gpac_result = subprocess.run(
                 f'{gpac_cmd} -i {nhml_name.absolute()} nhmlr -o {song_name.absolute()}',
-                capture_output=True, shell=if_shell()
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE if debug_enabled else subprocess.DEVNULL,
+                shell=if_shell()
             )
-            print(f"[DEBUG encapsulate] gpac return code: {gpac_result.returncode}")
-            if gpac_result.stderr:
-                print(f"[DEBUG encapsulate] gpac stderr: {gpac_result.stderr.decode('utf-8', errors='ignore')[:500]}")
+            if debug_enabled:
+                logger.debug("[encapsulate] gpac return code: %s", gpac_result.returncode)
+                if gpac_result.stderr:
+                    logger.debug(
+                        "[encapsulate] gpac stderr: %s",
+                        gpac_result.stderr[:500].decode('utf-8', errors='ignore')
+                    )
             if not song_name.exists():
-                print(f"[DEBUG encapsulate] ERROR: gpac output file not created!")
-            else:
-                print(f"[DEBUG encapsulate] gpac output size: {song_name.stat().st_size} bytes")
+                logger.warning("[encapsulate] gpac output file not created")
+            elif debug_enabled:
+                logger.debug("[encapsulate] gpac output size: %s bytes", song_name.stat().st_size)
 
             alac_params_atom_name = tmp_path / Path(f"{name}.atom")
-            print(f"[DEBUG encapsulate] decoderParams length: {len(song_info.decoderParams)} bytes")
-            print(f"[DEBUG encapsulate] decoderParams hex (first 48): {song_info.decoderParams[:48].hex()}")
+            if debug_enabled:
+                logger.debug("[encapsulate] decoderParams length: %s bytes", len(song_info.decoderParams))
+                logger.debug(
+                    "[encapsulate] decoderParams hex (first 48): %s",
+                    song_info.decoderParams[:48].hex()
+                )
             with open(alac_params_atom_name.absolute(), "wb") as f:
                 f.write(song_info.decoderParams)
 
@@ -322,19 +351,22 @@ def encapsulate(song_info: SongInfo, decrypted_media: bytes, atmos_convert: bool
                 f'{mp4edit_cmd} --insert moov/trak/mdia/minf/stbl/stsd/alac:{alac_params_atom_name.absolute()} '
                 f'{song_name.absolute()} {final_m4a_name.absolute()}'
             )
-            print(f"[DEBUG mp4edit] Command: {mp4edit_cmd_str}")
-            print(f"[DEBUG mp4edit] shell={if_shell()}")
+            if debug_enabled:
+                logger.debug("[mp4edit] Command: %s", mp4edit_cmd_str)
+                logger.debug("[mp4edit] shell=%s", if_shell())
+            output = subprocess.PIPE if debug_enabled else subprocess.DEVNULL
             result = subprocess.run(
                 mp4edit_cmd_str,
-                capture_output=True, shell=if_shell()
+                stdout=output, stderr=output, shell=if_shell()
             )
-            print(f"[DEBUG mp4edit] Return code: {result.returncode}")
-            if result.stdout:
-                print(f"[DEBUG mp4edit] stdout: {result.stdout.decode('utf-8', errors='ignore')}")
-            if result.stderr:
-                print(f"[DEBUG mp4edit] stderr: {result.stderr.decode('utf-8', errors='ignore')}")
+            if debug_enabled:
+                logger.debug("[mp4edit] Return code: %s", result.returncode)
+                if result.stdout:
+                    logger.debug("[mp4edit] stdout: %s", result.stdout.decode('utf-8', errors='ignore'))
+                if result.stderr:
+                    logger.debug("[mp4edit] stderr: %s", result.stderr.decode('utf-8', errors='ignore'))
             if not final_m4a_name.exists():
-                print(f"[DEBUG mp4edit] ERROR: Output file not created!")
+                logger.warning("[mp4edit] Output file not created")
             song_name = final_m4a_name
 
         case Codec.EC3 | Codec.AC3:
@@ -369,15 +401,11 @@ def encapsulate(song_info: SongInfo, decrypted_media: bytes, atmos_convert: bool
             )
 
     # 查找 MP4Box 工具
-    mp4box_cmd = "MP4Box"
-    mp4box_paths = [
+    mp4box_cmd = _find_tool(
+        "MP4Box",
         Path(r"C:\Program Files\GPAC\mp4box.exe"),
-        Path(__file__).parent.parent / "binaries" / "gpac" / "mp4box.exe",
-    ]
-    for mp4box_path in mp4box_paths:
-        if mp4box_path.exists():
-            mp4box_cmd = f'"{mp4box_path}"'
-            break
+        _BINARIES_DIR / "gpac" / "mp4box.exe",
+    )
 
     # 设置 M4A 标识
     if not if_raw_atmos(song_info.codec, atmos_convert):
@@ -444,32 +472,40 @@ def fix_encapsulate(song: bytes) -> bytes:
     with open(song_name.absolute(), "wb") as f:
         f.write(song)
 
-    print(f"[DEBUG fix_encapsulate] Input file size: {len(song)} bytes")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        logger.debug("[fix_encapsulate] Input file size: %s bytes", len(song))
 
     ffmpeg_cmd = (
         f"ffmpeg -y -i {song_name.absolute()} -fflags +bitexact -map_metadata 0 "
         f"-c:a copy -c:v copy {new_song_name.absolute()}"
     )
-    print(f"[DEBUG fix_encapsulate] FFmpeg command: {ffmpeg_cmd}")
+    if debug_enabled:
+        logger.debug("[fix_encapsulate] FFmpeg command: %s", ffmpeg_cmd)
 
     result = subprocess.run(
         ffmpeg_cmd,
-        capture_output=True, shell=if_shell()
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE if debug_enabled else subprocess.DEVNULL,
+        shell=if_shell()
     )
-    print(f"[DEBUG fix_encapsulate] FFmpeg return code: {result.returncode}")
-    if result.stderr:
-        stderr_text = result.stderr.decode('utf-8', errors='ignore')
-        # 检查 ALAC 相关错误
-        if 'alac' in stderr_text.lower() or 'invalid' in stderr_text.lower():
-            print(f"[DEBUG fix_encapsulate] FFmpeg stderr (ALAC related): {stderr_text[:1000]}")
+    if debug_enabled:
+        logger.debug("[fix_encapsulate] FFmpeg return code: %s", result.returncode)
+        if result.stderr:
+            stderr_text = result.stderr.decode('utf-8', errors='ignore')
+            # 检查 ALAC 相关错误
+            lowered = stderr_text.lower()
+            if 'alac' in lowered or 'invalid' in lowered:
+                logger.debug("[fix_encapsulate] FFmpeg stderr (ALAC related): %s", stderr_text[:1000])
 
     if not new_song_name.exists():
-        print(f"[DEBUG fix_encapsulate] ERROR: Output file not created!")
+        logger.warning("[fix_encapsulate] Output file not created")
         # FFmpeg 失败时返回原始数据
         tmp_dir.cleanup()
         return song
 
-    print(f"[DEBUG fix_encapsulate] Output file size: {new_song_name.stat().st_size} bytes")
+    if debug_enabled:
+        logger.debug("[fix_encapsulate] Output file size: %s bytes", new_song_name.stat().st_size)
 
     with open(new_song_name.absolute(), "rb") as f:
         encapsulated_song = f.read()
@@ -494,18 +530,10 @@ def fix_esds_box(raw_song: bytes, song: bytes) -> bytes:
     # 查找 mp4extract 与 mp4edit（Bento4 工具）
     mp4extract_cmd = "mp4extract"
     mp4edit_cmd = "mp4edit"
-    bento4_bin_paths = [
-        Path(__file__).parent.parent / "binaries" / "bento4" / "Bento4-SDK-1-6-0-641.x86_64-microsoft-win32" / "bin",
-        Path(r"C:\Program Files\Bento4"),
-        Path(r"C:\Bento4\bin"),
-    ]
-    for bento4_bin in bento4_bin_paths:
-        mp4extract_path = bento4_bin / "mp4extract.exe"
-        mp4edit_path = bento4_bin / "mp4edit.exe"
-        if mp4extract_path.exists():
-            mp4extract_cmd = f'"{mp4extract_path}"'
-            mp4edit_cmd = f'"{mp4edit_path}"'
-            break
+    bento4_bin = _find_bento4_bin_dir()
+    if bento4_bin:
+        mp4extract_cmd = f'"{bento4_bin / "mp4extract.exe"}"'
+        mp4edit_cmd = f'"{bento4_bin / "mp4edit.exe"}"'
 
     # 提取原始 ESDS box
     subprocess.run(
@@ -540,7 +568,7 @@ def check_song_integrity(song: bytes) -> bool:
 
     output = subprocess.run(
         f"ffmpeg -y -v error -i {song_name.absolute()} -c:a pcm_s16le -f null {null_device}",
-        capture_output=True, shell=if_shell()
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, shell=if_shell()
     )
 
     tmp_dir.cleanup()
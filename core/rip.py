@@ -24,9 +24,6 @@ from .utils import (
 
 logger = logging.getLogger(__name__)
 
-logging.basicConfig(level=logging.DEBUG)
-logger.setLevel(logging.DEBUG)
-
 
 class DownloadStatus(Enum):
     """下载任务状态。"""
@@ -162,11 +159,21 @@ class DecryptionManager:
         self, adam_id: str, key: str, sample: bytes, sample_index: int
     ):
         """解密成功回调。"""
-        logger.debug(f"[DecryptionManager] _on_decrypt_success called: adam_id={adam_id}, sample_index={sample_index}, sample_size={len(sample) if sample else 0}")
+        # 每个样本都会回调一次，调试日志需惰性格式化
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug(
+                "[DecryptionManager] _on_decrypt_success called: adam_id=%s, sample_index=%s, sample_size=%s",
+                adam_id, sample_index, len(sample) if sample else 0
+            )
         if adam_id in self._tasks:
             task = self._tasks[adam_id]
             task.on_sample_decrypted(sample_index, sample)
-            logger.debug(f"[{adam_id}] Decrypted sample {sample_index + 1}/{len(task.decrypted_samples)}")
+            if debug_enabled:
+                logger.debug(
+                    "[%s] Decrypted sample %s/%s",
+                    adam_id, sample_index + 1, len(task.decrypted_samples)
+                )
         else:
             logger.warning(f"[DecryptionManager] Received decrypt success for unknown task: {adam_id}")
 
@@ -199,22 +206,37 @@ class DecryptionManager:
             total_samples = len(task.song_info.samples)
             logger.info(f"[{task.adam_id}] Queuing {total_samples} samples for decryption...")
 
+            # 日志级别在单次解密期间不变，循环外判定一次
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            # 样本通常只引用少数几个 descIndex，按 descIndex 缓存解析结果
+            resolved_keys: Dict[int, tuple[Optional[str], bool]] = {}
+            # 先解析全部样本的密钥，再整批入队：缺少密钥时不会留下半首歌的请求
+            requests: list[tuple[str, bytes, int]] = []
             for sample_index, sample in enumerate(task.song_info.samples):
-                key, is_prefetch = resolve_decrypt_key(task.m3u8_info.keys, sample.descIndex)
+                resolved = resolved_keys.get(sample.descIndex)
+                if resolved is None:
+                    resolved = resolve_decrypt_key(task.m3u8_info.keys, sample.descIndex)
+                    resolved_keys[sample.descIndex] = resolved
+                key, is_prefetch = resolved
                 if not key:
                     logger.error(f"[{task.adam_id}] No decrypt key resolved for descIndex={sample.descIndex}")
                     task.on_decrypt_failed(f"无可用解密密钥 (descIndex={sample.descIndex})")
                     return False
 
-                logger.debug(f"[{task.adam_id}] Queuing sample {sample_index + 1}/{total_samples}, descIndex={sample.descIndex}, data_size={len(sample.data) if sample.data else 0}")
-                try:
-                    await self.wrapper_manager.decrypt(
-                        task.adam_id, key, sample.data, sample_index
+                if debug_enabled:
+                    logger.debug(
+                        "[%s] Queuing sample %s/%s, descIndex=%s, data_size=%s",
+                        task.adam_id, sample_index + 1, total_samples,
+                        sample.descIndex, len(sample.data) if sample.data else 0
                     )
-                except Exception as e:
-                    logger.error(f"[{task.adam_id}] Failed to queue sample {sample_index} for decryption: {e}")
-                    task.on_decrypt_failed(f"Failed to queue sample {sample_index}: {e}")
-                    return False
+                requests.append((key, sample.data, sample_index))
+
+            try:
+                await self.wrapper_manager.decrypt_many(task.adam_id, requests)
+            except Exception as e:
+                logger.error(f"[{task.adam_id}] Failed to queue samples for decryption: {e}")
+                task.on_decrypt_failed(f"Failed to queue samples: {e}")
+                return False
 
             logger.info(f"[{task.adam_id}] All {total_samples} samples queued, waiting for decryption completion...")
 
@@ -296,6 +318,7 @@ async def rip_song(
             progress_callback(status, message)
         logger.info(f"[{song_id}] Status: {status.value} - {message}")
 
+    extras: Optional[asyncio.Future] = None
     try:
         update_status(DownloadStatus.GETTING_METADATA, "获取歌曲信息...")
         logger.info(f"[{song_id}] Step 1: Calling api_client.get_song_info...")
@@ -342,13 +365,18 @@ async def rip_song(
         update_status(DownloadStatus.GETTING_LYRICS, "获取歌词...")
         logger.info(f"[{song_id}] Step 4: Getting lyrics (save_lyrics={config.save_lyrics}, hasTimeSyncedLyrics={raw_metadata.attributes.hasTimeSyncedLyrics})")
 
-        if config.save_lyrics and raw_metadata.attributes.hasTimeSyncedLyrics:
+        async def fetch_lyrics():
+            if not (config.save_lyrics and raw_metadata.attributes.hasTimeSyncedLyrics):
+                logger.info(f"[{song_id}] Step 4: Skipping lyrics (not configured or not available)")
+                return
             try:
                 logger.debug(f"[{song_id}] Step 4: Calling wrapper_manager.lyrics...")
                 ttml_lyrics = await wrapper_manager.lyrics(song_id, language, storefront)
                 logger.info(f"[{song_id}] Step 4: wrapper_manager.lyrics returned: {ttml_lyrics is not None}, len={len(ttml_lyrics) if ttml_lyrics else 0}")
                 if ttml_lyrics:
-                    lrc_lyrics = ttml_convent(
+                    # TTML 的 XML 解析较重，放到线程池避免阻塞事件循环
+                    lrc_lyrics = await run_sync(
+                        ttml_convent,
                         ttml_lyrics,
                         config.lyrics_format,
                         config.lyrics_extra
@@ -357,16 +385,17 @@ async def rip_song(
                     logger.info(f"[{song_id}] Step 4: Lyrics converted and set")
             except Exception as e:
                 logger.warning(f"[{song_id}] Step 4: Failed to get lyrics: {e}")
-        else:
-            logger.info(f"[{song_id}] Step 4: Skipping lyrics (not configured or not available)")
 
         need_cover = config.save_cover
         if plugin_config and plugin_config.download.convert_after_download:
             if plugin_config.download.convert_format.lower() in ("flac", "mp3"):
                 need_cover = True
 
-        logger.info(f"[{song_id}] Step 4: Getting cover (save_cover={need_cover}, cover_url={task.metadata.cover_url is not None})")
-        if need_cover and task.metadata.cover_url:
+        async def fetch_cover():
+            logger.info(f"[{song_id}] Step 4: Getting cover (save_cover={need_cover}, cover_url={task.metadata.cover_url is not None})")
+            if not (need_cover and task.metadata.cover_url):
+                logger.info(f"[{song_id}] Step 4: Skipping cover")
+                return
             try:
                 logger.debug(f"[{song_id}] Step 4: Calling api_client.get_cover...")
                 cover_data = await api_client.get_cover(
@@ -378,8 +407,10 @@ async def rip_song(
                 logger.info(f"[{song_id}] Step 4: Cover downloaded, size={len(cover_data) if cover_data else 0} bytes")
             except Exception as e:
                 logger.warning(f"[{song_id}] Step 4: Failed to get cover: {e}")
-        else:
-            logger.info(f"[{song_id}] Step 4: Skipping cover")
+
+        # 歌词走 wrapper、封面走 WebAPI，互不依赖，并发获取；
+        # 与后续 M3U8、音频下载及解密流水线重叠，写入元数据前再等待
+        extras = asyncio.gather(fetch_lyrics(), fetch_cover())
 
         update_status(DownloadStatus.DOWNLOADING, "下载中...")
         logger.info(f"[{song_id}] Step 5: Getting M3U8 and downloading audio...")
@@ -484,6 +515,8 @@ async def rip_song(
                     message=error_msg
                 )
 
+        await extras
+
         update_status(DownloadStatus.PROCESSING, "处理中...")
         logger.info(f"[{song_id}] Step 7: Processing and encapsulating...")
 
@@ -562,6 +595,10 @@ async def rip_song(
             status=DownloadStatus.FAILED,
             message=f"下载失败: {str(e)}"
         )
+    finally:
+        # 提前返回或出错时不再需要歌词与封面
+        if extras is not None and not extras.done():
+            extras.cancel()
 
 
 async def get_song_info(
@@ -6,21 +6,50 @@
 import logging
 import shutil
 import subprocess
+from functools import cache
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Optional, Any
 
 from .metadata import SongMetadata
 from .models import PlaylistInfo
-from .utils import get_song_name_and_dir_path, get_suffix, get_output_suffix, if_shell
+from .utils import (
+    get_song_name_and_dir_path, get_suffix, get_output_suffix, if_shell,
+    CONVERT_FORMAT_SUFFIXES
+)
 
 
 logger = logging.getLogger(__name__)
 
+# 各目标格式的 FFmpeg 音频编码参数
+_AUDIO_CODEC_ARGS = {
+    "flac": ("-c:a", "flac"),
+    "mp3": ("-c:a", "libmp3lame", "-q:a", "2"),
+    "opus": ("-c:a", "libopus", "-b:a", "192k"),
+    "wav": ("-c:a", "pcm_s16le"),
+}
+
+# 支持内嵌封面的目标格式
+_COVER_EMBED_FORMATS = frozenset({"flac", "mp3"})
+
+# 日志中保留的 FFmpeg 输出长度
+_STDERR_LOG_LIMIT = 500
+
+
+def _stderr_excerpt(text: str) -> str:
+    """截取 FFmpeg 输出开头用于日志，先截断再去空白，避免复制整段输出。"""
+    return text[:_STDERR_LOG_LIMIT].strip()
+
+
+@cache
+def _ffmpeg_path() -> Optional[str]:
+    """查找 ffmpeg 可执行文件路径，结果在进程内缓存。"""
+    return shutil.which("ffmpeg")
+
 
 def _check_file_integrity(file_path: str) -> bool:
     """使用 FFmpeg 校验已落盘文件完整性。"""
-    if not shutil.which("ffmpeg"):
+    if not _ffmpeg_path():
         logger.warning(f"未找到 ffmpeg，跳过完整性校验: {file_path}")
         return True
 
@@ -32,11 +61,12 @@ def _check_file_integrity(file_path: str) -> bool:
             "-c:a", "pcm_s16le",
             "-f", "null", null_device
         ],
-        capture_output=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         text=True
     )
     if result.stderr:
-        logger.warning(f"FFmpeg 完整性校验失败: {result.stderr.strip()[:500]}")
+        logger.warning(f"FFmpeg 完整性校验失败: {_stderr_excerpt(result.stderr)}")
     return not bool(result.stderr)
 
 
@@ -48,7 +78,7 @@ def _convert_m4a(
     keep_original: bool
 ) -> Optional[str]:
     """将 m4a 转换为指定格式，并尽量保留封面。"""
-    if not shutil.which("ffmpeg"):
+    if not _ffmpeg_path():
         logger.warning("未找到 ffmpeg，跳过格式转换")
         return None
 
@@ -56,27 +86,16 @@ def _convert_m4a(
     if input_path.suffix.lower() != ".m4a":
         return None
 
-    format_map = {
-        "flac": ".flac",
-        "mp3": ".mp3",
-        "opus": ".opus",
-        "wav": ".wav"
-    }
-    suffix = format_map.get(target_format.lower())
+    target = target_format.lower()
+    suffix = CONVERT_FORMAT_SUFFIXES.get(target)
     if not suffix:
         logger.warning(f"不支持的转换格式: {target_format}")
         return None
 
     output_path = input_path.with_suffix(suffix)
     cover_codec = "png" if cover_format == "png" else "mjpeg"
-    cover_supported = target_format.lower() in {"flac", "mp3"}
-
-    audio_codec_args = {
-        "flac": ["-c:a", "flac"],
-        "mp3": ["-c:a", "libmp3lame", "-q:a", "2"],
-        "opus": ["-c:a", "libopus", "-b:a", "192k"],
-        "wav": ["-c:a", "pcm_s16le"]
-    }
+    cover_supported = target in _COVER_EMBED_FORMATS
+    audio_codec_args = _AUDIO_CODEC_ARGS[target]
 
     with TemporaryDirectory() as tmp_dir:
         cmd = ["ffmpeg", "-y", "-i", str(input_path)]
@@ -88,31 +107,31 @@ def _convert_m4a(
                 "-i", str(cover_path),
                 "-map", "0:a",
                 "-map", "1:v",
-                *audio_codec_args[target_format.lower()],
+                *audio_codec_args,
                 "-c:v", cover_codec,
                 "-disposition:v", "attached_pic",
                 "-metadata:s:v", "title=cover",
                 "-metadata:s:v", "comment=Cover (front)",
                 "-map_metadata", "0"
             ]
-            if target_format.lower() == "mp3":
+            if target == "mp3":
                 cmd += ["-id3v2_version", "3"]
         else:
             if cover and not cover_supported:
                 logger.warning(f"{target_format} 不支持封面内嵌，已跳过")
             cmd += [
                 "-map", "0:a",
-                *audio_codec_args[target_format.lower()],
+                *audio_codec_args,
                 "-map_metadata", "0"
             ]
-            if target_format.lower() == "mp3":
+            if target == "mp3":
                 cmd += ["-id3v2_version", "3"]
         cmd.append(str(output_path))
 
         result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0 or not output_path.exists():
             err = result.stderr or result.stdout or "未知错误"
-            logger.warning(f"格式转换失败: {err.strip()[:500]}")
+            logger.warning(f"格式转换失败: {_stderr_excerpt(err)}")
             return None
 
     if not keep_original:
@@ -165,8 +184,16 @@ def save_lyrics(
     suffix = f".{lyrics_format}"
     file_path = full_dir / Path(song_name + suffix)
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(lyrics)
+    # 内容未变化时跳过重写：先比较文件大小，大小一致才读取比对
+    data = lyrics.encode("utf-8")
+    try:
+        if file_path.stat().st_size == len(data) and file_path.read_bytes() == data:
+            logger.debug(f"Lyrics unchanged, skip writing: {file_path}")
+            return str(file_path)
+    except OSError:
+        pass
+
+    file_path.write_bytes(data)
 
     logger.info(f"Saved lyrics to: {file_path}")
     return str(file_path)
@@ -2,8 +2,9 @@
 Apple Music Downloader 核心类型。
 """
 
-from typing import Optional, Any, Callable, Awaitable
+from typing import Optional, Any, Callable, Awaitable, Final
 
+import regex
 from pydantic import BaseModel
 
 
@@ -85,13 +86,27 @@ class CodecRegex:
     @classmethod
     def get_pattern_by_codec(cls, codec: str) -> Optional[str]:
         """获取指定编码的正则模式。"""
-        codec_pattern_mapping = {
-            Codec.ALAC: cls.RegexCodecAlac,
-            Codec.EC3: cls.RegexCodecAtmos,
-            Codec.AAC_DOWNMIX: cls.RegexCodecDownmix,
-            Codec.AAC_BINAURAL: cls.RegexCodecBinaural,
-            Codec.AAC: cls.RegexCodecAAC,
-            Codec.AAC_LEGACY: cls.RegexCodecAAC,
-            Codec.AC3: cls.RegexCodecAC3,
-        }
-        return codec_pattern_mapping.get(codec)
+        return _CODEC_PATTERNS.get(codec)
+
+    @classmethod
+    def get_compiled_by_codec(cls, codec: str) -> Optional["regex.Pattern"]:
+        """获取指定编码的预编译正则，使用 fullmatch 匹配。"""
+        return _COMPILED_CODEC_PATTERNS.get(codec)
+
+
+# 编码到正则模式的映射
+_CODEC_PATTERNS: Final[dict[str, str]] = {
+    Codec.ALAC: CodecRegex.RegexCodecAlac,
+    Codec.EC3: CodecRegex.RegexCodecAtmos,
+    Codec.AAC_DOWNMIX: CodecRegex.RegexCodecDownmix,
+    Codec.AAC_BINAURAL: CodecRegex.RegexCodecBinaural,
+    Codec.AAC: CodecRegex.RegexCodecAAC,
+    Codec.AAC_LEGACY: CodecRegex.RegexCodecAAC,
+    Codec.AC3: CodecRegex.RegexCodecAC3,
+}
+
+# 导入时预编译，供 fullmatch 整串匹配
+_COMPILED_CODEC_PATTERNS: Final[dict[str, "regex.Pattern"]] = {
+    codec: regex.compile(pattern, regex.ASCII)
+    for codec, pattern in _CODEC_PATTERNS.items()
+}
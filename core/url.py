@@ -10,6 +10,12 @@ import regex
 from pydantic import BaseModel
 
 
+# Apple Music 链接格式，模块加载时编译一次
+_APPLE_MUSIC_URL_RE = regex.compile(
+    r"https://music.apple.com/(.{2})/(song|album|playlist|artist).*/(pl.*|\d*)"
+)
+
+
 class URLType:
     """链接类型常量。"""
     Song = "song"
@@ -28,7 +34,7 @@ class AppleMusicURL(BaseModel):
     @classmethod
     def parse_url(cls, url: str) -> Optional["AppleMusicURL"]:
         """解析 Apple Music URL 并返回对应对象。"""
-        if not regex.match(r"https://music.apple.com/(.{2})/(song|album|playlist|artist).*/(pl.*|\d*)", url):
+        if not _APPLE_MUSIC_URL_RE.match(url):
             return None
 
         parsed_url = urlparse(url)
@@ -5,10 +5,12 @@ Apple Music 下载器工具函数。
 import asyncio
 import concurrent.futures
 import json
+import os
 import subprocess
 import sys
 from copy import deepcopy
 from datetime import datetime, timedelta
+from functools import lru_cache
 from itertools import islice
 from pathlib import Path
 from typing import Optional, Callable, Any
@@ -24,12 +26,22 @@ from .models import PlaylistInfo
 # 同步任务线程池
 executor_pool = concurrent.futures.ThreadPoolExecutor()
 
+# 运行平台在进程生命周期内不变，导入时判定一次
+_USE_SHELL = sys.platform not in ('win32', 'cygwin', 'cli')
+
+
+# 下载后转换支持的目标格式与文件后缀
+CONVERT_FORMAT_SUFFIXES = {
+    "flac": ".flac",
+    "mp3": ".mp3",
+    "opus": ".opus",
+    "wav": ".wav",
+}
+
 
 def if_shell() -> bool:
     """判断子进程是否需要 shell 模式。"""
-    if sys.platform in ('win32', 'cygwin', 'cli'):
-        return False
-    return True
+    return _USE_SHELL
 
 
 def byte_length(i: int) -> int:
@@ -44,24 +56,22 @@ def find_best_codec(
     max_sample_rate: int = 192000
 ) -> Optional[m3u8.Playlist]:
     """从 M3U8 中选择最合适的编码播放列表。"""
-    available_medias = [
-        playlist for playlist in parsed_m3u8.playlists
-        if regex.match(CodecRegex.get_pattern_by_codec(codec), playlist.stream_info.audio)
-    ]
-    available_medias.sort(key=lambda x: x.stream_info.average_bandwidth, reverse=True)
-
-    if codec == Codec.ALAC:
-        limited_medias = [
-            media for media in available_medias
-            if int(media.media[0].extras.get("bit_depth", 0)) <= max_bit_depth
-            and int(media.media[0].extras.get("sample_rate", 0)) <= max_sample_rate
-        ]
-    else:
-        limited_medias = available_medias
-
-    if not limited_medias:
-        return None
-    return limited_medias[0]
+    # 单次遍历完成编码过滤、音质限制与最高码率选择
+    pattern = CodecRegex.get_compiled_by_codec(codec)
+    best = None
+    for playlist in parsed_m3u8.playlists:
+        if not pattern.fullmatch(playlist.stream_info.audio):
+            continue
+        if codec == Codec.ALAC:
+            extras = playlist.media[0].extras
+            if (
+                int(extras.get("bit_depth", 0)) > max_bit_depth
+                or int(extras.get("sample_rate", 0)) > max_sample_rate
+            ):
+                continue
+        if best is None or playlist.stream_info.average_bandwidth > best.stream_info.average_bandwidth:
+            best = playlist
+    return best
 
 
 def chunk(it, size: int):
@@ -157,14 +167,18 @@ def get_valid_dir_name(dirname: str) -> str:
     return regex.sub(r"\.+$", "", get_valid_filename(dirname))
 
 
+# codec_id 解析时按此顺序尝试匹配
+_CODEC_ID_CANDIDATES = (
+    Codec.AC3, Codec.EC3, Codec.AAC, Codec.ALAC,
+    Codec.AAC_BINAURAL, Codec.AAC_DOWNMIX
+)
+
+
+@lru_cache(maxsize=256)
 def get_codec_from_codec_id(codec_id: str) -> str:
-    """根据 codec_id 解析编码类型。"""
-    codecs = [
-        Codec.AC3, Codec.EC3, Codec.AAC, Codec.ALAC,
-        Codec.AAC_BINAURAL, Codec.AAC_DOWNMIX
-    ]
-    for codec in codecs:
-        if regex.match(CodecRegex.get_pattern_by_codec(codec), codec_id):
+    """根据 codec_id 解析编码类型（结果按 codec_id 缓存）。"""
+    for codec in _CODEC_ID_CANDIDATES:
+        if CodecRegex.get_compiled_by_codec(codec).fullmatch(codec_id):
             return codec
     return ""
 
@@ -201,13 +215,7 @@ def get_output_suffix(
     """根据配置返回最终输出文件后缀。"""
     suffix = get_suffix(codec, convert_atmos)
     if convert_after_download and suffix == ".m4a":
-        format_map = {
-            "flac": ".flac",
-            "mp3": ".mp3",
-            "opus": ".opus",
-            "wav": ".wav"
-        }
-        mapped = format_map.get(convert_format.lower())
+        mapped = CONVERT_FORMAT_SUFFIXES.get(convert_format.lower())
         if mapped:
             return mapped
     return suffix
@@ -299,10 +307,13 @@ def playlist_write_song_index(playlist: PlaylistInfo) -> PlaylistInfo:
     return playlist
 
 
+# Mac（HFS+/MP4）时间戳纪元
+_MAC_EPOCH = datetime(1904, 1, 1)
+
+
 def convert_mac_timestamp_to_datetime(timestamp: int) -> datetime:
     """将 Mac 时间戳转换为 datetime。"""
-    d = datetime.strptime("01-01-1904", "%m-%d-%Y")
-    return d + timedelta(seconds=timestamp)
+    return _MAC_EPOCH + timedelta(seconds=timestamp)
 
 
 def check_dependencies(deps: list[str] = None) -> tuple[bool, Optional[str]]:
@@ -325,24 +336,36 @@ def check_dependencies(deps: list[str] = None) -> tuple[bool, Optional[str]]:
 
 async def run_sync(task: Callable, *args) -> Any:
     """在线程池中执行同步函数。"""
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     return await loop.run_in_executor(executor_pool, task, *args)
 
 
+@lru_cache(maxsize=8)
+def _load_storefront_index(storefronts_path: str) -> dict[str, tuple[str, tuple[str, ...]]]:
+    """读取 storefronts.json 并按大写地区 ID 建立语言索引（值不可变，可安全共享）。"""
+    with open(storefronts_path, "r", encoding="utf-8") as f:
+        storefronts = json.load(f)
+    return {
+        storefront["id"].upper(): (
+            storefront["attributes"]["defaultLanguageTag"],
+            tuple(storefront["attributes"]["supportedLanguageTags"])
+        )
+        for storefront in storefronts["data"]
+    }
+
+
 def query_language(region: str, storefronts_path: str = "assets/storefronts.json") -> Optional[tuple[str, list[str]]]:
     """查询地区默认语言与支持语言。"""
     try:
-        with open(storefronts_path, "r", encoding="utf-8") as f:
-            storefronts = json.load(f)
-            for storefront in storefronts["data"]:
-                if storefront["id"].upper() == region.upper():
-                    return (
-                        storefront["attributes"]["defaultLanguageTag"],
-                        storefront["attributes"]["supportedLanguageTags"]
-                    )
+        # 以绝对路径作缓存键，工作目录变化后不会命中其他位置的数据
+        entry = _load_storefront_index(os.path.abspath(storefronts_path)).get(region.upper())
     except (FileNotFoundError, json.JSONDecodeError, KeyError):
-        pass
-    return None
+        return None
+    if entry is None:
+        return None
+    default_language, languages = entry
+    # 返回列表副本，调用方修改不会影响缓存
+    return default_language, list(languages)
 
 
 def language_exist(region: str, language: str, storefronts_path: str = "assets/storefronts.json") -> bool:
@@ -7,6 +7,7 @@
 from __future__ import annotations
 
 import asyncio
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional, Dict
 
 from astrbot.api.event import AstrMessageEvent, MessageChain
@@ -17,6 +18,37 @@ if TYPE_CHECKING:
     from ..main import AppleMusicDownloader
 
 
+# 登录错误关键字（小写）与提示模板，按优先级匹配
+_LOGIN_ERROR_MESSAGES = (
+    ("already login", "× 该账户已登录: {account}"),
+    (
+        "login failed",
+        (
+            "× 登录失败: {account}\n"
+            "请检查用户名和密码是否正确\n\n"
+            "提示：如果启用了双因素认证，建议使用应用专用密码"
+        ),
+    ),
+    (
+        "no active subscription",
+        (
+            "× 登录失败: 该账户没有有效的 Apple Music 订阅\n"
+            "账户: {account}"
+        ),
+    ),
+)
+
+
+@dataclass(slots=True)
+class _Pending2FA:
+    """等待 2FA 验证码的登录会话。"""
+    username: str
+    password: str
+    event: AstrMessageEvent
+    wait_event: asyncio.Event = field(default_factory=asyncio.Event)
+    code: Optional[str] = None
+
+
 class AccountHandler:
     """
     账户管理处理器
@@ -27,8 +59,8 @@ class AccountHandler:
 
     def __init__(self, plugin: "AppleMusicDownloader"):
         self._plugin = plugin
-        # 存储等待 2FA 验证的会话 {user_id: {"username": ..., "password": ..., "event": ...}}
-        self._pending_2fa: Dict[str, dict] = {}
+        # 等待 2FA 验证的会话，按用户 ID 索引
+        self._pending_2fa: Dict[str, _Pending2FA] = {}
 
     async def handle_login(self, event: AstrMessageEvent, username: str = "", password: str = ""):
         """
@@ -86,30 +118,23 @@ class AccountHandler:
         try:
             async def on_2fa(uname: str, pwd: str) -> str:
                 """2FA 验证码回调"""
-                self._pending_2fa[user_id] = {
-                    "username": uname,
-                    "password": pwd,
-                    "event": event,
-                }
+                session = _Pending2FA(username=uname, password=pwd, event=event)
+                self._pending_2fa[user_id] = session
 
                 logger.info(f"2FA required for user {user_id}, username: {self._mask_email(uname)}")
 
-                wait_event = asyncio.Event()
-                self._pending_2fa[user_id]["wait_event"] = wait_event
-                self._pending_2fa[user_id]["code"] = None
-
                 await self._send_2fa_prompt(event, uname)
 
                 try:
-                    await asyncio.wait_for(wait_event.wait(), timeout=300)
-                    code = self._pending_2fa[user_id].get("code")
-                    if code:
-                        return code
+                    await asyncio.wait_for(session.wait_event.wait(), timeout=300)
+                    if session.code:
+                        return session.code
                     raise Exception("未收到验证码")
                 except asyncio.TimeoutError:
                     raise Exception("验证码输入超时")
                 finally:
-                    if user_id in self._pending_2fa:
+                    # 只移除本次会话，避免误删同一用户重新发起的登录
+                    if self._pending_2fa.get(user_id) is session:
                         del self._pending_2fa[user_id]
 
             await manager.login(username, password, on_2fa)
@@ -122,19 +147,13 @@ class AccountHandler:
 
         except Exception as e:
             error_msg = str(e)
-            if "already login" in error_msg.lower():
-                yield event.plain_result(f"× 该账户已登录: {self._mask_email(username)}")
-            elif "login failed" in error_msg.lower():
-                yield event.plain_result(
-                    f"× 登录失败: {self._mask_email(username)}\n"
-                    "请检查用户名和密码是否正确\n\n"
-                    "提示：如果启用了双因素认证，建议使用应用专用密码"
-                )
-            elif "no active subscription" in error_msg.lower():
-                yield event.plain_result(
-                    f"× 登录失败: 该账户没有有效的 Apple Music 订阅\n"
-                    f"账户: {self._mask_email(username)}"
-                )
+            lowered = error_msg.lower()
+            for needle, template in _LOGIN_ERROR_MESSAGES:
+                if needle in lowered:
+                    yield event.plain_result(
+                        template.format(account=self._mask_email(username))
+                    )
+                    break
             else:
                 yield event.plain_result(f"× 登录失败: {error_msg}")
 
@@ -179,14 +198,9 @@ class AccountHandler:
             return
 
         session = self._pending_2fa[user_id]
-        session["code"] = code
-
-        wait_event = session.get("wait_event")
-        if wait_event:
-            wait_event.set()
-            yield event.plain_result(f"... 正在验证: {code}")
-        else:
-            yield event.plain_result("× 验证会话已过期，请重新登录")
+        session.code = code
+        session.wait_event.set()
+        yield event.plain_result(f"... 正在验证: {code}")
 
     async def handle_logout(self, event: AstrMessageEvent, username: str = ""):
         """
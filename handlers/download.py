@@ -183,7 +183,7 @@ class DownloadHandler:
 
         # 检查用户任务数限制
         user_tasks = self._plugin._queue.get_user_tasks(sender_id)
-        pending_tasks = [t for t in user_tasks if t.status == TaskStatus.PENDING]
+        pending_tasks = [t for t in user_tasks if t.status is TaskStatus.PENDING]
         if len(pending_tasks) >= self._plugin._max_tasks_per_user:
             await event.send(
                 event.plain_result(
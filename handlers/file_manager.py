@@ -8,7 +8,8 @@ import os
 import asyncio
 import shutil
 import time
-from typing import TYPE_CHECKING, Tuple, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Tuple, Optional
 
 from astrbot.api.event import AstrMessageEvent, MessageChain
 from astrbot.api import logger
@@ -20,6 +21,21 @@ if TYPE_CHECKING:
     from ..main import AppleMusicDownloader
 
 
+# 可作为语音消息回退发送的音频后缀（小写）
+_RECORD_SUFFIXES = (".m4a", ".mp3")
+
+
+def _sum_sweep_results(results) -> Tuple[List[str], int, int]:
+    """按列汇总各目录的（已删除路径, 失败数, 跳过数），单次遍历完成。"""
+    removed: List[str] = []
+    errors = skipped = 0
+    for r, e, s in results:
+        removed.extend(r)
+        errors += e
+        skipped += s
+    return removed, errors, skipped
+
+
 class FileManager:
     """文件发送与清理管理"""
 
@@ -78,10 +94,12 @@ class FileManager:
 
         # 发送音频文件
         for file_path in result.file_paths[:5]:
-            if not os.path.exists(file_path):
+            # 一次 stat 同时完成存在性判断与大小获取
+            try:
+                file_size = os.stat(file_path).st_size
+            except OSError:
                 continue
 
-            file_size = os.path.getsize(file_path)
             file_name = os.path.basename(file_path)
 
             if file_size > max_size:
@@ -111,7 +129,7 @@ class FileManager:
                     exc_info=True,
                 )
                 try:
-                    if file_path.endswith((".m4a", ".mp3")):
+                    if os.path.splitext(file_path)[1].lower() in _RECORD_SUFFIXES:
                         record_chain = MessageChain(
                             chain=[Comp.Record(file=file_path, url=file_path)]
                         )
@@ -167,33 +185,17 @@ class FileManager:
                 yield event.plain_result("√ 未找到下载目录配置")
                 return
 
-            success_count = 0
-            fail_count = 0
-            total_items_cleaned = 0
-
-            for d in download_dirs:
-                if not d.exists():
-                    continue
-
-                try:
-                    items = list(d.iterdir())
-                    items = [i for i in items if i.name != ".gitkeep"]
-
-                    for item in items:
-                        try:
-                            if item.is_file() or item.is_symlink():
-                                item.unlink()
-                            elif item.is_dir():
-                                shutil.rmtree(item)
-                            total_items_cleaned += 1
-                        except Exception as e:
-                            fail_count += 1
-                            logger.warning(f"强制清理失败 {item}: {e}")
-
-                    success_count += 1
-                except Exception as e:
-                    fail_count += 1
-                    logger.warning(f"强制清理目录失败 {d}: {e}")
+            # 复用 scandir 清理逻辑，不构造 Path 列表，也不阻塞事件循环
+            now = time.time()
+            results = await asyncio.gather(*(
+                asyncio.to_thread(self._sweep_directory, d, True, now)
+                for d in download_dirs
+            ))
+            removed, fail_count, _ = _sum_sweep_results(results)
+            total_items_cleaned = len(removed)
+            if removed:
+                # 仅使引用已删除文件的缓存结果失效
+                self._plugin.downloader_service.invalidate_cached_paths(removed)
 
             if fail_count == 0:
                 if total_items_cleaned > 0:
@@ -252,48 +254,19 @@ class FileManager:
             logger.info("未找到下载目录配置，无需清理")
             return 0, 0
 
-        cleaned_count = 0
-        error_count = 0
-        skipped_count = 0
         now = time.time()
 
-        for downloads_dir in download_dirs:
-            try:
-                if not downloads_dir.exists():
-                    logger.debug(f"下载目录不存在，跳过: {downloads_dir}")
-                    continue
-
-                items = list(downloads_dir.iterdir())
-                items = [i for i in items if i.name != ".gitkeep"]
-
-                if not items:
-                    continue
-
-                for item in items:
-                    try:
-                        mtime = item.stat().st_mtime
-                        age = now - mtime
-
-                        if not force_all and age < self._file_ttl:
-                            skipped_count += 1
-                            continue
-
-                        if item.is_file() or item.is_symlink():
-                            item.unlink()
-                        elif item.is_dir():
-                            shutil.rmtree(item)
-                        cleaned_count += 1
-                    except PermissionError:
-                        error_count += 1
-                        logger.warning(f"权限不足，无法清理 {item}")
-                    except Exception as e:
-                        error_count += 1
-                        logger.warning(f"清理文件失败 {item}: {e}")
-            except Exception as e:
-                logger.warning(f"清理目录 {downloads_dir} 时出错: {e}")
-                continue
+        # 目录遍历与删除均为阻塞 I/O，放到线程中执行，多个目录并行处理
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self._sweep_directory, d, force_all, now)
+            for d in download_dirs
+        ))
+        removed, error_count, skipped_count = _sum_sweep_results(results)
+        cleaned_count = len(removed)
 
         if cleaned_count > 0:
+            # 仅使引用已删除文件的缓存结果失效
+            self._plugin.downloader_service.invalidate_cached_paths(removed)
             logger.info(f"定时清理完成，共清理 {cleaned_count} 个过期文件/文件夹")
         elif error_count > 0:
             logger.warning(f"清理结束，但有 {error_count} 个文件清理失败")
@@ -303,3 +276,45 @@ class FileManager:
             logger.debug("下载目录已为空，无需清理")
 
         return cleaned_count, error_count
+
+    def _sweep_directory(
+        self, downloads_dir: Path, force_all: bool, now: float
+    ) -> Tuple[List[str], int, int]:
+        """清理单个下载目录，返回 (已删除路径, 失败数, 跳过数)。"""
+        removed: List[str] = []
+        error_count = 0
+        skipped_count = 0
+
+        try:
+            if not downloads_dir.exists():
+                logger.debug(f"下载目录不存在，跳过: {downloads_dir}")
+                return [], 0, 0
+
+            # scandir 的 DirEntry 自带文件类型，避免逐项额外 stat
+            with os.scandir(downloads_dir) as it:
+                entries = [e for e in it if e.name != ".gitkeep"]
+
+            for entry in entries:
+                try:
+                    if not force_all:
+                        age = now - entry.stat().st_mtime
+                        if age < self._file_ttl:
+                            skipped_count += 1
+                            continue
+
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+                    removed.append(entry.path)
+                except PermissionError:
+                    error_count += 1
+                    logger.warning(f"权限不足，无法清理 {entry.path}")
+                except Exception as e:
+                    error_count += 1
+                    logger.warning(f"清理文件失败 {entry.path}: {e}")
+        except Exception as e:
+            error_count += 1
+            logger.warning(f"清理目录 {downloads_dir} 时出错: {e}")
+
+        return removed, error_count, skipped_count
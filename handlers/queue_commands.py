@@ -35,16 +35,17 @@ class QueueCommandsHandler:
 
         if not task_id:
             user_tasks = self._plugin._queue.get_user_tasks(sender_id)
-            pending = [t for t in user_tasks if t.status == TaskStatus.PENDING]
+            pending = [t for t in user_tasks if t.status is TaskStatus.PENDING]
 
             if not pending:
                 yield event.plain_result("○ 您没有等待中的任务")
                 return
 
             lines = ["您的等待任务:", ""]
+            positions = self._plugin._queue.get_user_positions(sender_id)
             for task in pending:
                 song_info = f"《{task.song_name}》" if task.song_name else ""
-                position = self._plugin._queue.get_position(task.task_id)
+                position = positions.get(task.task_id, -1)
                 lines.append(f"  • {task.task_id}: {song_info} (位置: {position})")
 
             lines.extend(
@@ -84,6 +85,7 @@ class QueueCommandsHandler:
             return
 
         lines = ["* 我的下载任务", "─" * 20]
+        positions = self._plugin._queue.get_user_positions(sender_id)
 
         for task in tasks:
             song_info = f"《{task.song_name}》" if task.song_name else task.url[:30]
@@ -97,8 +99,8 @@ class QueueCommandsHandler:
             }.get(task.status, "?")
 
             position = ""
-            if task.status == TaskStatus.PENDING:
-                pos = self._plugin._queue.get_position(task.task_id)
+            if task.status is TaskStatus.PENDING:
+                pos = positions.get(task.task_id, -1)
                 position = f" (队列位置: {pos})"
 
             lines.append(f"{status_icon} {task.task_id}: {song_info}{position}")
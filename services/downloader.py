@@ -3,7 +3,11 @@ Apple Music Downloader 服务。
 基于核心模块提供高层下载能力。
 """
 
-import logging
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -11,8 +15,6 @@ from typing import Optional, List, Dict, Any, Tuple
 
 from .logger import LoggerInterface, get_logger
 
-logging.basicConfig(level=logging.DEBUG)
-
 # 尝试相对导入,失败则使用绝对导入(支持独立运行)
 try:
     from ..core import (
@@ -93,7 +95,22 @@ class DownloadResult:
     codec: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
+class _CacheEntry:
+    """下载结果缓存条目。"""
+    result: DownloadResult
+    created_at: float
+    checked_at: float
+
+
+# 下载结果缓存上限（条目数），超出后按最近最少使用淘汰
+_CACHE_MAX_ENTRIES = 512
+
+# 缓存文件存在性校验的有效期（秒），期内命中不再访问文件系统
+_CACHE_RECHECK_INTERVAL = 60.0
+
+
+@dataclass(slots=True)
 class ServiceStatus:
     """服务状态。"""
     wrapper_connected: bool = False
@@ -142,8 +159,9 @@ class URLParser:
 class MetadataFetcher:
     """歌曲元数据获取器。"""
 
-    def __init__(self, api_client: WebAPI):
+    def __init__(self, api_client: WebAPI, logger: Optional[LoggerInterface] = None):
         self.api = api_client
+        self.logger = logger or get_logger()
 
     async def get_song_info(
         self,
@@ -178,9 +196,10 @@ class DownloaderService:
         self._api: Optional[WebAPI] = api_client
         self._metadata_fetcher: Optional[MetadataFetcher] = None
         self.logger = logger or get_logger()
+        self._download_dir: Optional[Path] = None
 
         # 下载缓存
-        self._cache: Dict[str, DownloadResult] = {}
+        self._cache: OrderedDict[str, _CacheEntry] = OrderedDict()
         self._cache_ttl = 7 * 24 * 3600  # 7 天
 
     async def init(self) -> Tuple[bool, str]:
@@ -192,7 +211,7 @@ class DownloaderService:
                     cdn_ip=""
                 )
 
-            self._metadata_fetcher = MetadataFetcher(self._api)
+            self._metadata_fetcher = MetadataFetcher(self._api, self.logger)
 
             success, msg = await self.wrapper_service.init()
             if not success:
@@ -242,11 +261,10 @@ class DownloaderService:
             )
 
         cache_key = f"{url}|{quality.value}"
-        if not force and cache_key in self._cache:
-            cached = self._cache[cache_key]
-            if cached.success and all(Path(p).exists() for p in cached.file_paths):
-                self.logger.info(f"Using cached download result for {url}")
-                return cached
+        cached = None if force else self._get_cached(cache_key)
+        if cached and cached.result.success and self._cached_files_present(cached):
+            self.logger.info(f"Using cached download result for {url}")
+            return cached.result
 
         if parsed["type"] != URLType.Song:
             return DownloadResult(
@@ -331,11 +349,11 @@ class DownloaderService:
                     }
                 )
 
-                self._cache[cache_key] = download_result
+                self._put_cached(cache_key, download_result)
 
                 return download_result
 
-            if result.status == DownloadStatus.SKIPPED:
+            if result.status is DownloadStatus.SKIPPED:
                 expected_path = get_output_path(
                     codec=result.codec or codec,
                     metadata=result.metadata,
@@ -384,10 +402,76 @@ class DownloaderService:
             self.logger.warning(f"Failed to get song metadata: {e}")
             return None
 
+    def _get_cached(self, key: str) -> Optional[_CacheEntry]:
+        """读取未过期的缓存条目。"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created_at > self._cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry
+
+    def _put_cached(self, key: str, result: DownloadResult) -> None:
+        """写入缓存并淘汰最久未使用的条目。"""
+        now = time.monotonic()
+        self._cache[key] = _CacheEntry(result=result, created_at=now, checked_at=now)
+        self._cache.move_to_end(key)
+        while len(self._cache) > _CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def _cached_files_present(self, entry: _CacheEntry) -> bool:
+        """确认缓存的文件仍在磁盘上，近期已校验过则直接信任。"""
+        now = time.monotonic()
+        if now - entry.checked_at < _CACHE_RECHECK_INTERVAL:
+            return True
+        paths = entry.result.file_paths
+        if len(self._existing_subset(paths)) != len(set(paths)):
+            return False
+        entry.checked_at = now
+        return True
+
+    @staticmethod
+    def _existing_subset(paths: List[str]) -> set:
+        """返回 paths 中实际存在的路径，每个父目录只扫描一次。"""
+        entries_by_dir: Dict[str, set] = {}
+        existing = set()
+        for p in paths:
+            parent, name = os.path.split(p)
+            names = entries_by_dir.get(parent)
+            if names is None:
+                try:
+                    with os.scandir(parent or ".") as it:
+                        names = {entry.name for entry in it}
+                except OSError:
+                    names = set()
+                entries_by_dir[parent] = names
+            if name in names:
+                existing.add(p)
+        return existing
+
     def get_download_dirs(self, quality: Optional[DownloadQuality] = None) -> List[Path]:
         """获取下载目录列表。"""
-        download_dir = self.config.get_download_path()
-        return [download_dir]
+        # 下载目录在服务生命周期内不变，首次解析后缓存
+        if self._download_dir is None:
+            self._download_dir = self.config.get_download_path()
+        return [self._download_dir]
+
+    def invalidate_cached_paths(self, removed_paths: List[str]) -> int:
+        """移除引用了已删除文件（或已删除目录下文件）的缓存条目，返回移除数量。"""
+        removed = {os.path.abspath(p) for p in removed_paths}
+        prefixes = tuple(p + os.sep for p in removed)
+        stale = [
+            key for key, entry in self._cache.items()
+            if any(
+                path in removed or path.startswith(prefixes)
+                for path in map(os.path.abspath, entry.result.file_paths)
+            )
+        ]
+        for key in stale:
+            del self._cache[key]
+        return len(stale)
 
     def clear_cache(self):
         """清理下载缓存。"""
@@ -6,6 +6,12 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Any
 
+# 运行环境在导入时探测一次，避免每次获取 logger 都走导入流程
+try:
+    from astrbot.api import logger as _astrbot_logger
+except ImportError:
+    _astrbot_logger = None
+
 
 class LoggerInterface(ABC):
     """日志接口抽象类"""
@@ -43,10 +49,12 @@ class PythonLogger(LoggerInterface):
         self._logger = logging.getLogger(name)
 
     def debug(self, msg: str, *args, **kwargs) -> None:
-        self._logger.debug(msg, *args, **kwargs)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(msg, *args, **kwargs)
 
     def info(self, msg: str, *args, **kwargs) -> None:
-        self._logger.info(msg, *args, **kwargs)
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(msg, *args, **kwargs)
 
     def warning(self, msg: str, *args, **kwargs) -> None:
         self._logger.warning(msg, *args, **kwargs)
@@ -83,12 +91,10 @@ class AstrBotLoggerAdapter(LoggerInterface):
 
 def get_logger(name: str = "apple_music_downloader") -> LoggerInterface:
     """获取 logger 实例（自动检测环境）。"""
-    try:
-        from astrbot.api import logger as astrbot_logger
-        return AstrBotLoggerAdapter(astrbot_logger)
-    except ImportError:
-        # 独立运行模式，使用 Python 日志
-        return PythonLogger(name)
+    if _astrbot_logger is not None:
+        return AstrBotLoggerAdapter(_astrbot_logger)
+    # 独立运行模式，使用 Python 日志
+    return PythonLogger(name)
 
 
 # 全局 logger 实例(向后兼容)
@@ -6,7 +6,7 @@
 from __future__ import annotations
 import asyncio
 import logging
-from typing import Callable, Awaitable, Optional, List, TYPE_CHECKING
+from typing import Callable, Awaitable, Dict, Optional, List, TYPE_CHECKING
 
 from .task import DownloadTask, TaskStatus, TaskPriority, TaskStateMachine
 from .events import QueueEventEmitter, QueueEvent, TaskEventAdapter, EventSubscription
@@ -24,6 +24,9 @@ logger = logging.getLogger(__name__)
 TaskEventHandler = Callable[[DownloadTask], Awaitable[None]]
 DownloadFunction = Callable[[DownloadTask], Awaitable["DownloadResult"]]
 
+# 批量取消时同时进行的取消事件广播数
+_CANCEL_NOTIFY_CONCURRENCY = 8
+
 
 class DownloadQueue:
     """下载队列系统门面。"""
@@ -143,9 +146,17 @@ class DownloadQueue:
 
         for task in removed:
             task.try_transition_to(TaskStatus.CANCELLED)
-            await self._events.emit(QueueEvent.TASK_CANCELLED, task)
             self._stats.record_failure(task, reason="cancelled")
 
+        # 各任务的取消通知相互独立，限流并发广播
+        semaphore = asyncio.Semaphore(_CANCEL_NOTIFY_CONCURRENCY)
+
+        async def notify(task: DownloadTask) -> None:
+            async with semaphore:
+                await self._events.emit(QueueEvent.TASK_CANCELLED, task)
+
+        await asyncio.gather(*(notify(task) for task in removed))
+
         count = len(removed)
         if count > 0:
             return count, f"已取消 {count} 个任务"
@@ -164,6 +175,10 @@ class DownloadQueue:
         """获取任务在队列中的位置（从 1 开始）。"""
         return self._storage.get_position(task_id)
 
+    def get_user_positions(self, user_id: str) -> Dict[str, int]:
+        """获取用户全部排队任务的位置映射 {task_id: 位置}。"""
+        return self._storage.get_user_positions(user_id)
+
     def has_duplicate(self, user_id: str, url: str) -> bool:
         """检查用户是否有重复待处理任务。"""
         return self._storage.has_duplicate(user_id, url)
@@ -247,7 +262,7 @@ class DownloadQueue:
     def format_queue_status(self) -> str:
         """获取格式化队列状态。"""
         return self._formatter.format_queue_status(
-            tasks=self.list_tasks(),
+            tasks=self._storage.snapshot(),
             current_task=self.current_task,
             stats=self.get_stats(),
         )
@@ -5,10 +5,11 @@
 
 from __future__ import annotations
 import asyncio
+import bisect
 import logging
 from enum import Enum, auto
 from typing import Callable, Awaitable, Any, Dict, List, Optional, TYPE_CHECKING
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 if TYPE_CHECKING:
     from .task import DownloadTask
@@ -37,7 +38,7 @@ EventHandler = Callable[["DownloadTask"], Awaitable[None]]
 GenericEventHandler = Callable[..., Awaitable[None]]
 
 
-@dataclass
+@dataclass(slots=True)
 class EventSubscription:
     """单个事件订阅。"""
     event: QueueEvent
@@ -90,12 +91,11 @@ class QueueEventEmitter:
 
     def _add_subscription(self, subscription: EventSubscription) -> None:
         """添加订阅到注册表。"""
-        if subscription.event not in self._subscriptions:
-            self._subscriptions[subscription.event] = []
-
-        subs = self._subscriptions[subscription.event]
-        subs.append(subscription)
-        subs.sort()
+        # 订阅列表写时复制：变更时替换整个列表，广播时可直接遍历而无需拷贝
+        subs = list(self._subscriptions.get(subscription.event, ()))
+        # 列表已按优先级有序，二分插入到同优先级订阅之后，保持注册顺序
+        bisect.insort(subs, subscription)
+        self._subscriptions[subscription.event] = subs
 
     def off(
         self,
@@ -123,18 +123,20 @@ class QueueEventEmitter:
         if subscription.event not in self._subscriptions:
             return False
 
-        try:
-            self._subscriptions[subscription.event].remove(subscription)
-            return True
-        except ValueError:
+        # 按对象身份匹配：相等但不同的订阅不应被视为同一个
+        subs = self._subscriptions[subscription.event]
+        remaining = [sub for sub in subs if sub is not subscription]
+        if len(remaining) == len(subs):
             return False
+        self._subscriptions[subscription.event] = remaining
+        return True
 
     async def emit(self, event: QueueEvent, *args: Any, **kwargs: Any) -> int:
         """向已注册处理器广播事件。"""
         if event not in self._subscriptions:
             return 0
 
-        subscriptions = self._subscriptions[event].copy()
+        subscriptions = self._subscriptions[event]
         called_count = 0
         to_remove: List[EventSubscription] = []
 
@@ -167,7 +169,7 @@ class QueueEventEmitter:
         if event not in self._subscriptions:
             return []
 
-        subscriptions = self._subscriptions[event].copy()
+        subscriptions = self._subscriptions[event]
         to_remove: List[EventSubscription] = []
 
         async def safe_call(sub: EventSubscription) -> Optional[Exception]:
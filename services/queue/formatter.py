@@ -5,9 +5,11 @@
 
 from __future__ import annotations
 import time
-from typing import List, Optional, TYPE_CHECKING
+from typing import ClassVar, List, Optional, Sequence, TYPE_CHECKING
 from abc import ABC, abstractmethod
 
+from .task import TaskStatus
+
 if TYPE_CHECKING:
     from .task import DownloadTask
     from .stats import QueueStats
@@ -19,7 +21,7 @@ class QueueFormatter(ABC):
     @abstractmethod
     def format_queue_status(
         self,
-        tasks: List["DownloadTask"],
+        tasks: Sequence["DownloadTask"],
         current_task: Optional["DownloadTask"],
         stats: "QueueStats",
     ) -> str:
@@ -44,7 +46,7 @@ class QueueFormatter(ABC):
 class ChineseFormatter(QueueFormatter):
     """中文队列显示格式化器。"""
 
-    STATUS_DISPLAY = {
+    STATUS_DISPLAY: ClassVar[dict[str, str]] = {
         "pending": "等待中",
         "processing": "下载中",
         "completed": "已完成",
@@ -53,16 +55,25 @@ class ChineseFormatter(QueueFormatter):
         "timeout": "超时",
     }
 
-    PRIORITY_DISPLAY = {
+    PRIORITY_DISPLAY: ClassVar[dict[str, str]] = {
         "LOW": "低",
         "NORMAL": "普通",
         "HIGH": "高",
         "URGENT": "紧急",
     }
 
+    STATUS_EMOJI: ClassVar[dict[str, str]] = {
+        "pending": "⏳",
+        "processing": "🔄",
+        "completed": "✅",
+        "failed": "❌",
+        "cancelled": "🚫",
+        "timeout": "⏰",
+    }
+
     def format_queue_status(
         self,
-        tasks: List["DownloadTask"],
+        tasks: Sequence["DownloadTask"],
         current_task: Optional["DownloadTask"],
         stats: "QueueStats",
     ) -> str:
@@ -166,9 +177,9 @@ class ChineseFormatter(QueueFormatter):
             lines.append(f"{i}. {status_emoji} **{task_desc}**")
             lines.append(f"   ID: {task.task_id} | {status_text} | {task.quality}")
 
-            if task.status.value == "pending":
+            if task.status is TaskStatus.PENDING:
                 lines.append(f"   等待时间：{self._format_duration(task.wait_time)}")
-            elif task.status.value == "processing":
+            elif task.status is TaskStatus.PROCESSING:
                 lines.append(f"   处理时间：{self._format_duration(task.process_time)}")
 
             lines.append("")
@@ -241,9 +252,7 @@ class ChineseFormatter(QueueFormatter):
 
     def _format_timestamp(self, timestamp: float) -> str:
         """格式化时间戳为本地时间字符串。"""
-        import datetime
-        dt = datetime.datetime.fromtimestamp(timestamp)
-        return dt.strftime("%H:%M:%S")
+        return time.strftime("%H:%M:%S", time.localtime(timestamp))
 
     def _truncate_url(self, url: str, max_length: int = 40) -> str:
         """截断 URL 便于显示。"""
@@ -253,15 +262,7 @@ class ChineseFormatter(QueueFormatter):
 
     def _get_status_emoji(self, status: str) -> str:
         """获取状态对应的表情。"""
-        emoji_map = {
-            "pending": "⏳",
-            "processing": "🔄",
-            "completed": "✅",
-            "failed": "❌",
-            "cancelled": "🚫",
-            "timeout": "⏰",
-        }
-        return emoji_map.get(status, "❓")
+        return self.STATUS_EMOJI.get(status, "❓")
 
 
 class MinimalFormatter(QueueFormatter):
@@ -269,7 +270,7 @@ class MinimalFormatter(QueueFormatter):
 
     def format_queue_status(
         self,
-        tasks: List["DownloadTask"],
+        tasks: Sequence["DownloadTask"],
         current_task: Optional["DownloadTask"],
         stats: "QueueStats",
     ) -> str:
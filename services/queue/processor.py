@@ -6,7 +6,7 @@
 from __future__ import annotations
 import asyncio
 import logging
-from typing import Callable, Awaitable, Optional, Any, TYPE_CHECKING
+from typing import Callable, Awaitable, Optional, TYPE_CHECKING
 
 from .task import DownloadTask, TaskStatus
 from .storage import TaskQueue
@@ -18,12 +18,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-import sys
-logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
-logger.setLevel(logging.DEBUG)
-
 DownloadFunction = Callable[[DownloadTask], Awaitable["DownloadResult"]]
 
+# 空闲等待时间相对 poll_interval 的最大倍数
+_MAX_IDLE_BACKOFF = 10
+
 
 class TaskProcessor:
     """处理队列任务的执行循环。"""
@@ -89,6 +88,7 @@ class TaskProcessor:
                 return True
 
             self._running = False
+            self._queue.wake_waiters()
 
             if self._processor_task:
                 try:
@@ -118,16 +118,22 @@ class TaskProcessor:
         logger.debug("[Processor] Processing loop started")
         logger.info(f"[Processor] Running={self._running}, Timeout={self._task_timeout}s")
 
+        # 空闲等待时间：持续空闲时逐步加倍，有任务后恢复初始值
+        idle_interval = self._poll_interval
+        max_idle_interval = self._poll_interval * _MAX_IDLE_BACKOFF
+
         while self._running:
             try:
                 logger.debug("[Processor] Waiting for next task from queue...")
                 task = await self._queue.pop()
 
                 if task is None:
-                    logger.debug(f"[Processor] Queue empty, sleeping for {self._poll_interval}s")
-                    await asyncio.sleep(self._poll_interval)
+                    logger.debug("[Processor] Queue empty, waiting up to %ss", idle_interval)
+                    if not await self._queue.wait_not_empty(idle_interval):
+                        idle_interval = min(idle_interval * 2, max_idle_interval)
                     continue
 
+                idle_interval = self._poll_interval
                 logger.info(f"[Processor] Got task {task.task_id}, processing...")
                 await self._process_task(task)
 
@@ -202,28 +208,38 @@ class TaskProcessor:
             f"(process_time={task.process_time:.2f}s)"
         )
 
-    async def _handle_failure(
+    async def _finish_unsuccessful(
         self,
         task: DownloadTask,
+        status: TaskStatus,
+        event: QueueEvent,
+        reason: str,
         error: str
     ) -> None:
-        """处理任务失败。"""
+        """以失败类终态结束任务：记录错误、统计并发出事件。"""
         task.error = error
-        task.try_transition_to(TaskStatus.FAILED)
+        task.try_transition_to(status)
 
-        self._stats.record_failure(task, reason="failed")
-        await self._events.emit(QueueEvent.TASK_FAILED, task)
+        self._stats.record_failure(task, reason=reason)
+        await self._events.emit(event, task)
 
+    async def _handle_failure(
+        self,
+        task: DownloadTask,
+        error: str
+    ) -> None:
+        """处理任务失败。"""
+        await self._finish_unsuccessful(
+            task, TaskStatus.FAILED, QueueEvent.TASK_FAILED, "failed", error
+        )
         logger.warning(f"Task {task.task_id} failed: {error}")
 
     async def _handle_timeout(self, task: DownloadTask) -> None:
         """处理任务超时。"""
-        task.error = f"Task timed out after {self._task_timeout}s"
-        task.try_transition_to(TaskStatus.TIMEOUT)
-
-        self._stats.record_failure(task, reason="timeout")
-        await self._events.emit(QueueEvent.TASK_TIMEOUT, task)
-
+        await self._finish_unsuccessful(
+            task, TaskStatus.TIMEOUT, QueueEvent.TASK_TIMEOUT, "timeout",
+            f"Task timed out after {self._task_timeout}s"
+        )
         logger.warning(
             f"Task {task.task_id} timed out "
             f"(timeout={self._task_timeout}s)"
@@ -231,12 +247,10 @@ class TaskProcessor:
 
     async def _handle_cancelled(self, task: DownloadTask) -> None:
         """处理任务取消。"""
-        task.error = "Task was cancelled"
-        task.try_transition_to(TaskStatus.CANCELLED)
-
-        self._stats.record_failure(task, reason="cancelled")
-        await self._events.emit(QueueEvent.TASK_CANCELLED, task)
-
+        await self._finish_unsuccessful(
+            task, TaskStatus.CANCELLED, QueueEvent.TASK_CANCELLED, "cancelled",
+            "Task was cancelled"
+        )
         logger.info(f"Task {task.task_id} was cancelled")
 
 
@@ -5,15 +5,16 @@
 
 from __future__ import annotations
 import time
-from dataclasses import dataclass, field
-from typing import Optional, List, TYPE_CHECKING
+from dataclasses import dataclass
+from typing import List, TYPE_CHECKING
 from collections import deque
+from itertools import islice
 
 if TYPE_CHECKING:
-    from .task import DownloadTask, TaskStatus
+    from .task import DownloadTask
 
 
-@dataclass
+@dataclass(slots=True)
 class QueueStats:
     """队列统计快照。"""
     total_tasks: int = 0
@@ -41,7 +42,7 @@ class QueueStats:
         return self.completed_tasks / total
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskTiming:
     """单个任务的时间统计。"""
     task_id: str
@@ -62,8 +63,13 @@ class QueueStatsCollector:
         """初始化统计收集器。"""
         self._max_history = max_history
         self._throughput_window = throughput_window
+        self._reset_state()
 
-        self._timings: deque[TaskTiming] = deque(maxlen=max_history)
+    def _reset_state(self) -> None:
+        """以全新容器初始化统计状态，旧容器整体交由回收。"""
+        self._timings: deque[TaskTiming] = deque(maxlen=self._max_history)
+        # 吞吐窗口内成功任务的完成时刻（单调时钟），随记录追加、随查询从头部淘汰
+        self._window_successes: deque[float] = deque()
 
         self._total_completed = 0
         self._total_failed = 0
@@ -73,31 +79,31 @@ class QueueStatsCollector:
         self._total_wait_time = 0.0
         self._total_process_time = 0.0
 
-    def record_completion(self, task: DownloadTask) -> None:
-        """记录任务成功完成。"""
-        timing = TaskTiming(
+    def _record_timing(self, task: DownloadTask, success: bool) -> None:
+        """追加任务时间记录并累计耗时。"""
+        wait_time = task.wait_time
+        process_time = task.process_time
+        self._timings.append(TaskTiming(
             task_id=task.task_id,
-            wait_time=task.wait_time,
-            process_time=task.process_time,
+            wait_time=wait_time,
+            process_time=process_time,
             completed_at=time.time(),
-            success=True
-        )
-        self._timings.append(timing)
+            success=success
+        ))
+        self._total_wait_time += wait_time
+        self._total_process_time += process_time
 
+    def record_completion(self, task: DownloadTask) -> None:
+        """记录任务成功完成。"""
+        self._record_timing(task, success=True)
+        now = time.monotonic()
+        self._window_successes.append(now)
+        self._prune_window(now)
         self._total_completed += 1
-        self._total_wait_time += task.wait_time
-        self._total_process_time += task.process_time
 
     def record_failure(self, task: DownloadTask, reason: str = "failed") -> None:
         """记录任务失败。"""
-        timing = TaskTiming(
-            task_id=task.task_id,
-            wait_time=task.wait_time,
-            process_time=task.process_time,
-            completed_at=time.time(),
-            success=False
-        )
-        self._timings.append(timing)
+        self._record_timing(task, success=False)
 
         if reason == "timeout":
             self._total_timeout += 1
@@ -106,9 +112,6 @@ class QueueStatsCollector:
         else:
             self._total_failed += 1
 
-        self._total_wait_time += task.wait_time
-        self._total_process_time += task.process_time
-
     def get_stats(
         self,
         pending_count: int = 0,
@@ -148,33 +151,27 @@ class QueueStatsCollector:
 
     def _calculate_throughput(self) -> float:
         """计算吞吐量（窗口内每分钟成功任务数）。"""
-        if not self._timings:
-            return 0.0
+        self._prune_window(time.monotonic())
+        window_minutes = self._throughput_window / 60.0
+        return len(self._window_successes) / window_minutes
 
-        now = time.time()
+    def _prune_window(self, now: float) -> None:
+        """淘汰吞吐窗口之外的成功记录。"""
+        window = self._window_successes
         window_start = now - self._throughput_window
-
-        successful_in_window = sum(
-            1 for t in self._timings
-            if t.completed_at >= window_start and t.success
-        )
-
-        window_minutes = self._throughput_window / 60.0
-        return successful_in_window / window_minutes
+        while window and window[0] < window_start:
+            window.popleft()
 
     def get_recent_timings(self, count: int = 10) -> List[TaskTiming]:
         """获取最近任务时间统计。"""
-        return list(self._timings)[-count:]
+        # 从尾部截取，避免复制整个 deque
+        recent = list(islice(reversed(self._timings), max(count, 0)))
+        recent.reverse()
+        return recent
 
     def reset(self) -> None:
         """重置全部统计。"""
-        self._timings.clear()
-        self._total_completed = 0
-        self._total_failed = 0
-        self._total_cancelled = 0
-        self._total_timeout = 0
-        self._total_wait_time = 0.0
-        self._total_process_time = 0.0
+        self._reset_state()
 
     def __repr__(self) -> str:
         return (
@@ -5,11 +5,13 @@
 
 from __future__ import annotations
 import asyncio
-import heapq
-from typing import Optional, List, Dict, Iterator, Callable
+import bisect
+from typing import Optional, List, Dict, Iterator
 from abc import ABC, abstractmethod
+from collections import deque
+from itertools import islice
 
-from .task import DownloadTask, TaskStatus, TaskPriority
+from .task import DownloadTask
 
 
 class PriorityStrategy(ABC):
@@ -32,12 +34,12 @@ class FIFOWithPriorityStrategy(PriorityStrategy):
     def compare(self, task1: DownloadTask, task2: DownloadTask) -> int:
         if task1.priority.value != task2.priority.value:
             return task2.priority.value - task1.priority.value
-        if task1.created_at != task2.created_at:
-            return -1 if task1.created_at < task2.created_at else 1
+        if task1.created_mono != task2.created_mono:
+            return -1 if task1.created_mono < task2.created_mono else 1
         return 0
 
     def sort_key(self, task: DownloadTask) -> tuple:
-        return (-task.priority.value, task.created_at)
+        return (-task.priority.value, task.created_mono)
 
 
 class TaskQueue:
@@ -52,12 +54,18 @@ class TaskQueue:
         self._max_size = max_size
         self._strategy = strategy or FIFOWithPriorityStrategy()
 
-        self._tasks: List[DownloadTask] = []
+        # 按优先级有序；出队取队首，用 deque 避免列表头部删除的整体移动
+        self._tasks: deque[DownloadTask] = deque()
+        # 只读快照，队列变更时失效，重复查看队列时无需每次复制
+        self._snapshot: Optional[tuple[DownloadTask, ...]] = None
 
         self._by_id: Dict[str, DownloadTask] = {}
         self._by_user: Dict[str, List[str]] = {}  # 用户ID -> [任务ID]
+        self._by_user_url: Dict[tuple[str, str], str] = {}  # (用户ID, URL) -> 任务ID
 
         self._lock = asyncio.Lock()
+        # 队列非空信号，供处理器空闲时等待而非轮询
+        self._not_empty = asyncio.Event()
 
 
     @property
@@ -89,17 +97,20 @@ class TaskQueue:
             if task.task_id in self._by_id:
                 return False, f"任务已存在: {task.task_id}"
 
-            if self.has_duplicate_unlocked(task.user_id, task.url):
-                existing = self._find_duplicate_unlocked(task.user_id, task.url)
+            existing = self._find_duplicate_unlocked(task.user_id, task.url)
+            if existing:
                 return False, f"您已有相同的下载任务在队列中（ID: {existing.task_id}）"
 
-            self._tasks.append(task)
-            self._sort()
+            # 队列始终有序，按排序键二分插入，无需整体重排
+            bisect.insort(self._tasks, task, key=self._strategy.sort_key)
+            self._snapshot = None
+            self._not_empty.set()
 
             self._by_id[task.task_id] = task
             if task.user_id not in self._by_user:
                 self._by_user[task.user_id] = []
             self._by_user[task.user_id].append(task.task_id)
+            self._by_user_url[(task.user_id, task.url)] = task.task_id
 
             position = self._get_position_unlocked(task.task_id)
             return True, f"已加入队列，位置：第 {position} 位"
@@ -108,18 +119,13 @@ class TaskQueue:
         """取出最高优先级任务。"""
         async with self._lock:
             if not self._tasks:
+                self._not_empty.clear()
                 return None
 
-            task = self._tasks.pop(0)
+            task = self._tasks.popleft()
+            self._snapshot = None
 
-            del self._by_id[task.task_id]
-            if task.user_id in self._by_user:
-                try:
-                    self._by_user[task.user_id].remove(task.task_id)
-                except ValueError:
-                    pass
-                if not self._by_user[task.user_id]:
-                    del self._by_user[task.user_id]
+            self._unindex(task)
 
             return task
 
@@ -141,15 +147,9 @@ class TaskQueue:
                 self._tasks.remove(task)
             except ValueError:
                 return None
+            self._snapshot = None
 
-            del self._by_id[task_id]
-            if task.user_id in self._by_user:
-                try:
-                    self._by_user[task.user_id].remove(task_id)
-                except ValueError:
-                    pass
-                if not self._by_user[task.user_id]:
-                    del self._by_user[task.user_id]
+            self._unindex(task)
 
             return task
 
@@ -174,38 +174,75 @@ class TaskQueue:
                 return i + 1
         return -1
 
+    def get_user_positions(self, user_id: str) -> Dict[str, int]:
+        """单次遍历获取用户全部排队任务的位置（从 1 开始）。"""
+        return {
+            task.task_id: i
+            for i, task in enumerate(self._tasks, 1)
+            if task.user_id == user_id
+        }
+
     def has_duplicate(self, user_id: str, url: str) -> bool:
         """检查用户是否存在重复待处理任务。"""
         return self.has_duplicate_unlocked(user_id, url)
 
     def has_duplicate_unlocked(self, user_id: str, url: str) -> bool:
         """无锁检查重复任务。"""
-        task_ids = self._by_user.get(user_id, [])
-        for task_id in task_ids:
-            task = self._by_id.get(task_id)
-            if task and task.url == url and task.is_pending:
-                return True
-        return False
+        return self._find_duplicate_unlocked(user_id, url) is not None
 
     def _find_duplicate_unlocked(self, user_id: str, url: str) -> Optional[DownloadTask]:
-        """查找重复任务。"""
-        task_ids = self._by_user.get(user_id, [])
-        for task_id in task_ids:
-            task = self._by_id.get(task_id)
-            if task and task.url == url and task.is_pending:
-                return task
+        """查找重复任务（按用户与 URL 索引直接定位）。"""
+        task = self._by_id.get(self._by_user_url.get((user_id, url), ""))
+        if task and task.is_pending:
+            return task
         return None
 
+    def _unindex(self, task: DownloadTask) -> None:
+        """从各索引中移除任务。"""
+        self._by_id.pop(task.task_id, None)
+        if self._by_user_url.get((task.user_id, task.url)) == task.task_id:
+            del self._by_user_url[(task.user_id, task.url)]
+        if task.user_id in self._by_user:
+            try:
+                self._by_user[task.user_id].remove(task.task_id)
+            except ValueError:
+                pass
+            if not self._by_user[task.user_id]:
+                del self._by_user[task.user_id]
+
+
+    async def wait_not_empty(self, timeout: float) -> bool:
+        """等待队列出现任务，超时返回 False。"""
+        if self._not_empty.is_set():
+            return True
+        # asyncio.wait 超时不抛异常，避免 3.10 上 asyncio.TimeoutError 与内置 TimeoutError 不同类的问题
+        waiter = asyncio.ensure_future(self._not_empty.wait())
+        try:
+            done, _ = await asyncio.wait((waiter,), timeout=timeout)
+        finally:
+            waiter.cancel()
+        return bool(done)
+
+    def wake_waiters(self) -> None:
+        """唤醒等待中的处理器（如停止时）。"""
+        self._not_empty.set()
+
 
     def __iter__(self) -> Iterator[DownloadTask]:
         """按优先级顺序遍历任务。"""
-        return iter(self._tasks.copy())
+        return iter(self.snapshot())
+
+    def snapshot(self) -> tuple[DownloadTask, ...]:
+        """获取按优先级排序的只读任务快照。"""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._tasks)
+        return self._snapshot
 
     def list_tasks(self, limit: Optional[int] = None) -> List[DownloadTask]:
         """获取任务列表。"""
         if limit is None:
-            return self._tasks.copy()
-        return self._tasks[:limit]
+            return list(self._tasks)
+        return list(islice(self._tasks, limit))
 
 
     async def clear(self) -> int:
@@ -213,8 +250,11 @@ class TaskQueue:
         async with self._lock:
             count = len(self._tasks)
             self._tasks.clear()
+            self._snapshot = None
+            self._not_empty.clear()
             self._by_id.clear()
             self._by_user.clear()
+            self._by_user_url.clear()
             return count
 
     async def remove_user_tasks(self, user_id: str) -> List[DownloadTask]:
@@ -228,7 +268,9 @@ class TaskQueue:
                 if task:
                     try:
                         self._tasks.remove(task)
+                        self._snapshot = None
                         del self._by_id[task_id]
+                        self._by_user_url.pop((user_id, task.url), None)
                         removed.append(task)
                     except (ValueError, KeyError):
                         pass
@@ -241,7 +283,8 @@ class TaskQueue:
 
     def _sort(self) -> None:
         """按排序策略排序任务。"""
-        self._tasks.sort(key=self._strategy.sort_key)
+        self._tasks = deque(sorted(self._tasks, key=self._strategy.sort_key))
+        self._snapshot = None
 
     async def resort(self) -> None:
         """重新排序队列。"""
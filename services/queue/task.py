@@ -5,11 +5,11 @@
 
 from __future__ import annotations
 import asyncio
+import secrets
 import time
-import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, Any, Set, FrozenSet
+from typing import Optional, Any, FrozenSet
 
 
 class TaskStatus(Enum):
@@ -91,11 +91,12 @@ class InvalidStateTransitionError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadTask:
     """下载任务数据容器。"""
 
-    task_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    # 8 位十六进制随机 ID，直接生成字符串，无需构造 UUID 对象
+    task_id: str = field(default_factory=lambda: secrets.token_hex(4))
 
     url: str = ""
     quality: str = "alac"
@@ -115,6 +116,11 @@ class DownloadTask:
     started_at: Optional[float] = None
     completed_at: Optional[float] = None
 
+    # 时长计算使用单调时钟，不受系统时间调整影响；上面的墙钟时间仅用于展示
+    _created_mono: float = field(default_factory=time.monotonic, repr=False, compare=False)
+    _started_mono: Optional[float] = field(default=None, repr=False, compare=False)
+    _completed_mono: Optional[float] = field(default=None, repr=False, compare=False)
+
     result: Optional[Any] = field(default=None, repr=False)
     error: Optional[str] = None
 
@@ -131,10 +137,12 @@ class DownloadTask:
         TaskStateMachine.validate_transition(self._status, new_status)
         self._status = new_status
 
-        if new_status == TaskStatus.PROCESSING:
+        if new_status is TaskStatus.PROCESSING:
             self.started_at = time.time()
+            self._started_mono = time.monotonic()
         elif new_status.is_terminal:
             self.completed_at = time.time()
+            self._completed_mono = time.monotonic()
 
     def try_transition_to(self, new_status: TaskStatus) -> bool:
         """尝试切换状态，成功返回 True。"""
@@ -144,48 +152,53 @@ class DownloadTask:
         return False
 
 
+    @property
+    def created_mono(self) -> float:
+        """创建时刻（单调时钟），用于排队先后比较。"""
+        return self._created_mono
+
     @property
     def wait_time(self) -> float:
         """队列等待时长（秒）。"""
-        if self.started_at:
-            return self.started_at - self.created_at
-        return time.time() - self.created_at
+        if self._started_mono is not None:
+            return self._started_mono - self._created_mono
+        return time.monotonic() - self._created_mono
 
     @property
     def process_time(self) -> float:
         """处理时长（秒）。"""
-        if not self.started_at:
+        if self._started_mono is None:
             return 0.0
-        end_time = self.completed_at or time.time()
-        return end_time - self.started_at
+        end_time = self._completed_mono or time.monotonic()
+        return end_time - self._started_mono
 
     @property
     def total_time(self) -> float:
         """从创建到完成的总时长（秒）。"""
-        if not self.completed_at:
-            return time.time() - self.created_at
-        return self.completed_at - self.created_at
+        if self._completed_mono is None:
+            return time.monotonic() - self._created_mono
+        return self._completed_mono - self._created_mono
 
 
     @property
     def is_pending(self) -> bool:
-        return self._status == TaskStatus.PENDING
+        return self._status is TaskStatus.PENDING
 
     @property
     def is_processing(self) -> bool:
-        return self._status == TaskStatus.PROCESSING
+        return self._status is TaskStatus.PROCESSING
 
     @property
     def is_completed(self) -> bool:
-        return self._status == TaskStatus.COMPLETED
+        return self._status is TaskStatus.COMPLETED
 
     @property
     def is_failed(self) -> bool:
-        return self._status == TaskStatus.FAILED
+        return self._status is TaskStatus.FAILED
 
     @property
     def is_cancelled(self) -> bool:
-        return self._status == TaskStatus.CANCELLED
+        return self._status is TaskStatus.CANCELLED
 
     @property
     def is_terminal(self) -> bool:
@@ -200,7 +213,7 @@ class DownloadTask:
         """用于优先队列排序。"""
         if self.priority.value != other.priority.value:
             return self.priority.value > other.priority.value
-        return self.created_at < other.created_at
+        return self._created_mono < other._created_mono
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, DownloadTask):
@@ -3,6 +3,9 @@ Wrapper 服务管理。
 负责连接远程 wrapper-manager。
 """
 
+from __future__ import annotations
+
+import asyncio
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple, Union
@@ -17,7 +20,7 @@ except ImportError:
     from core.grpc import WrapperManager, WrapperManagerException
     from core.config import PluginConfig
 
-@dataclass
+@dataclass(slots=True)
 class WrapperStatus:
     """服务状态（Wrapper）。"""
     connected: bool = False
@@ -63,6 +66,8 @@ class WrapperService:
 
         self._manager: Optional[WrapperManager] = None
         self._connected = False
+        # 串行化连接过程，并发的重连请求合并为一次
+        self._connect_lock = asyncio.Lock()
 
     @property
     def is_connected(self) -> bool:
@@ -87,7 +92,18 @@ class WrapperService:
             return False, f"初始化失败: {str(e)}"
 
     async def _connect_to_manager(self) -> Tuple[bool, str]:
-        """连接 wrapper-manager 服务。"""
+        """连接 wrapper-manager 服务，已有连接进行中时等待其结果。"""
+        async with self._connect_lock:
+            if self._connected and self._manager:
+                return True, "服务已初始化"
+            if self._manager:
+                # 上次连接失败遗留的实例，先关闭其通道
+                await self._manager.close()
+                self._manager = None
+            return await self._open_connection()
+
+    async def _open_connection(self) -> Tuple[bool, str]:
+        """建立到 wrapper-manager 的新连接。"""
         try:
             self._manager = WrapperManager()
             await self._manager.init(self.url, self.secure)
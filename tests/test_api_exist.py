@@ -0,0 +1,67 @@
+"""
+地区存在性探测测试
+
+仅缓存确定结果（200/404），限流或服务端错误不进入缓存。
+"""
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# 将项目根目录加入路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.api import WebAPI
+
+# 每个测试使用独立事件循环，alru_cache 切换循环时的提示与本测试无关
+pytestmark = pytest.mark.filterwarnings("ignore:alru_cache detected event loop change")
+
+
+def _fake_api(*status_codes: int) -> tuple[WebAPI, list[str]]:
+    """构造按顺序返回给定状态码的 WebAPI，并记录请求 URL。"""
+    api = WebAPI()
+    calls: list[str] = []
+    codes = iter(status_codes)
+
+    async def fake_request(method, url, **kwargs):
+        calls.append(url)
+        return httpx.Response(next(codes), request=httpx.Request(method, url))
+
+    api._request = fake_request
+    return api, calls
+
+
+@pytest.mark.asyncio
+async def test_album_exist_does_not_cache_rate_limit():
+    api, calls = _fake_api(429, 200)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.album_exist("1", "jp")
+    assert await api.album_exist("1", "jp") is True
+    # 确定结果已缓存，不再请求
+    assert await api.album_exist("1", "jp") is True
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_song_exist_caches_not_found():
+    api, calls = _fake_api(404)
+
+    assert await api.song_exist("1", "jp") is False
+    assert await api.song_exist("1", "jp") is False
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_song_exist_raises_on_server_error():
+    api, calls = _fake_api(503, 401, 200)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.song_exist("2", "us")
+    with pytest.raises(httpx.HTTPStatusError):
+        await api.song_exist("2", "us")
+    assert await api.song_exist("2", "us") is True
+    assert len(calls) == 3
@@ -0,0 +1,123 @@
+"""
+下载结果缓存测试
+
+覆盖 LRU 淘汰、TTL 过期与文件存在性复核。
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# 将项目根目录加入路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import services.downloader as downloader_module
+from core.config import PluginConfig
+from services.downloader import DownloaderService, DownloadResult
+from services.wrapper_service import WrapperService
+
+
+class FakeClock:
+    """可手动推进的单调时钟。"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(downloader_module, "time", SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    config = PluginConfig()
+    config.plugin_dir = tmp_path
+    return DownloaderService(config, WrapperService(config))
+
+
+def _result(*paths: str) -> DownloadResult:
+    return DownloadResult(success=True, message="ok", file_paths=list(paths))
+
+
+def test_cache_evicts_least_recently_used(downloader, clock, monkeypatch):
+    monkeypatch.setattr(downloader_module, "_CACHE_MAX_ENTRIES", 2)
+
+    downloader._put_cached("a", _result())
+    downloader._put_cached("b", _result())
+    # 命中 a 后，b 成为最久未使用的条目
+    assert downloader._get_cached("a") is not None
+    downloader._put_cached("c", _result())
+
+    assert list(downloader._cache) == ["a", "c"]
+    assert downloader._get_cached("b") is None
+
+
+def test_cache_overwrite_refreshes_recency(downloader, clock, monkeypatch):
+    monkeypatch.setattr(downloader_module, "_CACHE_MAX_ENTRIES", 2)
+
+    downloader._put_cached("a", _result())
+    downloader._put_cached("b", _result())
+    downloader._put_cached("a", _result("new"))
+    downloader._put_cached("c", _result())
+
+    assert list(downloader._cache) == ["a", "c"]
+    assert downloader._get_cached("a").result.file_paths == ["new"]
+
+
+def test_cache_entry_expires_after_ttl(downloader, clock):
+    downloader._put_cached("a", _result())
+
+    clock.now += downloader._cache_ttl
+    assert downloader._get_cached("a") is not None
+
+    clock.now += 1
+    assert downloader._get_cached("a") is None
+    assert "a" not in downloader._cache
+
+
+def test_cached_files_rechecked_after_interval(downloader, clock, tmp_path):
+    song = tmp_path / "song.m4a"
+    song.write_bytes(b"data")
+    downloader._put_cached("a", _result(str(song)))
+    entry = downloader._get_cached("a")
+
+    # 校验有效期内不访问文件系统
+    song.unlink()
+    assert downloader._cached_files_present(entry)
+
+    clock.now += downloader_module._CACHE_RECHECK_INTERVAL
+    assert not downloader._cached_files_present(entry)
+
+    song.write_bytes(b"data")
+    assert downloader._cached_files_present(entry)
+    assert entry.checked_at == clock.now
+
+
+def test_clear_cache_drops_all_entries(downloader, clock):
+    downloader._put_cached("a", _result())
+    downloader._put_cached("b", _result())
+
+    downloader.clear_cache()
+
+    assert not downloader._cache
+
+
+def test_invalidate_cached_paths_only_drops_affected_entries(downloader, clock, tmp_path):
+    album_dir = tmp_path / "Artist - Album"
+    downloader._put_cached("in_dir", _result(str(album_dir / "01.m4a")))
+    downloader._put_cached("file", _result(str(tmp_path / "single.m4a")))
+    downloader._put_cached("kept", _result(str(tmp_path / "Artist - Album 2" / "01.m4a")))
+
+    dropped = downloader.invalidate_cached_paths([str(album_dir), str(tmp_path / "single.m4a")])
+
+    assert dropped == 2
+    assert list(downloader._cache) == ["kept"]
@@ -0,0 +1,121 @@
+"""
+任务队列测试
+
+覆盖优先级有序插入、移除后的顺序与用户/URL 索引维护。
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 将项目根目录加入路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.queue import DownloadTask, TaskPriority, TaskQueue, TaskStatus
+
+
+def _task(
+    task_id: str,
+    created: float,
+    priority: TaskPriority = TaskPriority.NORMAL,
+    user_id: str = "u1",
+    url: str = "",
+) -> DownloadTask:
+    return DownloadTask(
+        task_id=task_id,
+        url=url or f"https://music.apple.com/cn/song/{task_id}",
+        user_id=user_id,
+        priority=priority,
+        _created_mono=created,
+    )
+
+
+def _ids(queue: TaskQueue) -> list[str]:
+    return [task.task_id for task in queue]
+
+
+@pytest.mark.asyncio
+async def test_push_keeps_priority_then_fifo_order():
+    queue = TaskQueue(max_size=10)
+    await queue.push(_task("n1", 1.0))
+    await queue.push(_task("h1", 2.0, TaskPriority.HIGH))
+    await queue.push(_task("n2", 3.0))
+    await queue.push(_task("u1", 4.0, TaskPriority.URGENT))
+    await queue.push(_task("h2", 5.0, TaskPriority.HIGH))
+    # 创建较早的任务晚入队，仍按创建先后排在同优先级前面
+    await queue.push(_task("n0", 0.5))
+
+    assert _ids(queue) == ["u1", "h1", "h2", "n0", "n1", "n2"]
+    assert queue.get_position("n1") == 5
+
+
+@pytest.mark.asyncio
+async def test_remove_and_pop_keep_order_and_indexes():
+    queue = TaskQueue(max_size=10)
+    for task in (
+        _task("a", 1.0),
+        _task("b", 2.0, TaskPriority.HIGH),
+        _task("c", 3.0, user_id="u2"),
+        _task("d", 4.0),
+    ):
+        await queue.push(task)
+
+    removed = await queue.remove("a")
+    assert removed.task_id == "a"
+    assert _ids(queue) == ["b", "c", "d"]
+    assert queue.get("a") is None
+    assert await queue.remove("a") is None
+
+    popped = await queue.pop()
+    assert popped.task_id == "b"
+    assert _ids(queue) == ["c", "d"]
+    assert queue.get_user_positions("u1") == {"d": 2}
+    assert [t.task_id for t in queue.get_user_tasks("u1")] == ["d"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_lookup_follows_user_url_index():
+    queue = TaskQueue(max_size=10)
+    url = "https://music.apple.com/cn/song/1"
+    await queue.push(_task("a", 1.0, url=url))
+
+    ok, _ = await queue.push(_task("b", 2.0, url=url))
+    assert not ok
+    assert queue.has_duplicate("u1", url)
+    # 其他用户提交相同链接不算重复
+    ok, _ = await queue.push(_task("c", 3.0, user_id="u2", url=url))
+    assert ok
+
+    await queue.remove("a")
+    assert not queue.has_duplicate("u1", url)
+    ok, _ = await queue.push(_task("d", 4.0, url=url))
+    assert ok
+
+
+@pytest.mark.asyncio
+async def test_duplicate_ignores_tasks_no_longer_pending():
+    queue = TaskQueue(max_size=10)
+    url = "https://music.apple.com/cn/song/1"
+    task = _task("a", 1.0, url=url)
+    await queue.push(task)
+
+    task.transition_to(TaskStatus.CANCELLED)
+
+    assert not queue.has_duplicate("u1", url)
+
+
+@pytest.mark.asyncio
+async def test_remove_user_tasks_clears_user_indexes():
+    queue = TaskQueue(max_size=10)
+    await queue.push(_task("a", 1.0))
+    await queue.push(_task("b", 2.0, user_id="u2"))
+    await queue.push(_task("c", 3.0))
+
+    removed = await queue.remove_user_tasks("u1")
+
+    assert sorted(t.task_id for t in removed) == ["a", "c"]
+    assert _ids(queue) == ["b"]
+    assert queue.get_user_tasks("u1") == []
+    assert not queue.has_duplicate("u1", "https://music.apple.com/cn/song/a")
@@ -0,0 +1,184 @@
+"""
+Wrapper Manager 客户端测试
+
+覆盖通道池负载选择与解密请求批量入队后回复到样本的映射。
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# 将项目根目录加入路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.grpc.manager import ReplyCode, WrapperManager, WrapperManagerException
+from core.grpc.manager_pb2 import DecryptData, DecryptReply
+from core.rip import DecryptionManager, DownloadTask
+from core.types import M3U8Info, SampleInfo, SongInfo
+
+
+def _decrypted(sample: bytes) -> bytes:
+    """模拟解密结果：样本字节逆序。"""
+    return sample[::-1]
+
+
+class FakeUnaryStub:
+    """记录调用次数的一元调用桩。"""
+
+    def __init__(self, gate: asyncio.Event, fail: bool = False):
+        self.calls = 0
+        self._gate = gate
+        self._fail = fail
+
+    async def Status(self, request):
+        self.calls += 1
+        await self._gate.wait()
+        if self._fail:
+            raise RuntimeError("boom")
+        return "ok"
+
+
+class FakeDecryptStub:
+    """按请求原样回显解密结果的双向流桩，可指定首次失败的样本。"""
+
+    def __init__(self, fail_once: set[int] = frozenset()):
+        self._fail_once = set(fail_once)
+
+    def Decrypt(self, requests):
+        async def replies():
+            async for request in requests:
+                data = request.data
+                reply = DecryptReply(
+                    data=DecryptData(
+                        adam_id=data.adam_id,
+                        key=data.key,
+                        sample_index=data.sample_index,
+                        sample=_decrypted(data.sample),
+                    )
+                )
+                if data.sample_index in self._fail_once:
+                    self._fail_once.discard(data.sample_index)
+                    reply.header.code = ReplyCode.ERROR
+                    # 失败回复携带原始样本，供重试使用
+                    reply.data.sample = data.sample
+                else:
+                    reply.header.code = ReplyCode.SUCCESS
+                yield reply
+        return replies()
+
+
+def _manager_with_stubs(stubs) -> WrapperManager:
+    manager = WrapperManager()
+    manager._stubs = list(stubs)
+    manager._inflight = [0] * len(stubs)
+    return manager
+
+
+def test_acquire_channel_prefers_least_loaded():
+    manager = _manager_with_stubs([object(), object(), object()])
+    manager._inflight = [2, 0, 1]
+
+    assert manager._acquire_channel() == 1
+    assert manager._inflight == [2, 1, 1]
+    # 负载相同的通道间轮询
+    assert manager._acquire_channel() in (1, 2)
+    assert sorted(manager._inflight) == [1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_unary_call_without_channels_fails_fast():
+    manager = WrapperManager()
+
+    # 未初始化（或已关闭）时直接报未连接，且不进入重试
+    with pytest.raises(WrapperManagerException, match="not connected"):
+        await manager.m3u8("1")
+
+
+@pytest.mark.asyncio
+async def test_call_unary_spreads_calls_and_releases_slots():
+    gate = asyncio.Event()
+    stubs = [FakeUnaryStub(gate), FakeUnaryStub(gate, fail=True)]
+    manager = _manager_with_stubs(stubs)
+
+    calls = [
+        asyncio.ensure_future(manager._call_unary(lambda stub: stub.Status, None))
+        for _ in range(4)
+    ]
+    await asyncio.sleep(0)
+    assert manager._inflight == [2, 2]
+
+    gate.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert [stub.calls for stub in stubs] == [2, 2]
+    assert results.count("ok") == 2
+    # 调用失败同样回收在途计数
+    assert manager._inflight == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_decrypt_many_replies_reach_callbacks_in_order():
+    manager = WrapperManager()
+    manager._stub = FakeDecryptStub()
+    manager._loop = asyncio.get_running_loop()
+    received = []
+    done = asyncio.Event()
+
+    async def on_success(adam_id, key, sample, sample_index):
+        received.append((adam_id, key, sample, sample_index))
+        if len(received) == 3:
+            done.set()
+
+    async def on_failure(adam_id, key, sample, sample_index):
+        raise AssertionError("unexpected failure")
+
+    try:
+        await manager.decrypt_init(on_success, on_failure)
+        await manager.decrypt_many("song", [
+            ("k0", b"\x01\x02", 0),
+            ("k1", b"\x03\x04", 1),
+            ("k0", b"\x05\x06", 2),
+        ])
+        await asyncio.wait_for(done.wait(), 1)
+    finally:
+        await manager.close()
+
+    assert received == [
+        ("song", "k0", b"\x02\x01", 0),
+        ("song", "k1", b"\x04\x03", 1),
+        ("song", "k0", b"\x06\x05", 2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_decrypt_song_maps_batch_replies_to_samples():
+    manager = WrapperManager()
+    # 样本 1 首次解密失败，重试后乱序到达
+    manager._stub = FakeDecryptStub(fail_once={1})
+    manager._loop = asyncio.get_running_loop()
+
+    samples = [bytes([i, i + 1, i + 2]) for i in range(0, 15, 3)]
+    task = DownloadTask(adam_id="1234", storefront="cn", language="zh-Hans-CN")
+    task.m3u8_info = M3U8Info(uri="", keys=["key-a", "key-b"], codec_id="")
+    task.song_info = SongInfo(
+        codec="alac",
+        raw=b"",
+        samples=[
+            SampleInfo(data=data, duration=1024, descIndex=i % 2)
+            for i, data in enumerate(samples)
+        ],
+        nhml="",
+        params={},
+    )
+    task.init_decrypted_samples()
+
+    try:
+        ok = await DecryptionManager(manager).decrypt_song(task, timeout=1)
+    finally:
+        await manager.close()
+
+    assert ok
+    assert task.decrypted_samples == [_decrypted(data) for data in samples]